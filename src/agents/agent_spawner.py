@@ -4,19 +4,22 @@ Spawns, monitors, and manages up to 100 trading agents.
 """
 
 import asyncio
-import uuid
 import logging
 import random
+import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from operator import attrgetter
 
 from src.constants import Strategy, SWARM as SwarmConfig
 from src.agents.treasury_agent import get_treasury_agent
 
 logger = logging.getLogger(__name__)
 
+_ALL_STRATEGIES = tuple(Strategy)
+
 
 class AgentStatus(Enum):
     """Agent lifecycle states"""
@@ -27,7 +30,7 @@ class AgentStatus(Enum):
     TERMINATED = "terminated"
 
 
-@dataclass
+@dataclass(slots=True)
 class SwarmAgent:
     """Individual AI trading agent"""
     agent_id: str
@@ -46,20 +49,30 @@ class SwarmAgent:
     wins: int = 0
     losses: int = 0
     
-    # Timing
-    last_trade_at: Optional[datetime] = None
-    cooldown_until: Optional[datetime] = None
+    # Timing (time.monotonic() seconds)
+    last_trade_at: Optional[float] = None
+    cooldown_until: Optional[float] = None
+    
+    # Cached metrics (refreshed whenever capital or results change)
+    _win_rate: float = field(default=0.0, init=False, repr=False)
+    _roi_pct: float = field(default=0.0, init=False, repr=False)
     
     @property
     def win_rate(self) -> float:
-        total = self.wins + self.losses
-        return (self.wins / total * 100) if total > 0 else 0.0
+        return self._win_rate
     
     @property
     def roi_pct(self) -> float:
-        if self.allocated_capital <= 0:
-            return 0.0
-        return (self.total_pnl / self.allocated_capital) * 100
+        return self._roi_pct
+    
+    def refresh_metrics(self):
+        """Recompute cached win rate and ROI after a capital or trade update"""
+        total = self.wins + self.losses
+        self._win_rate = (self.wins / total * 100) if total > 0 else 0.0
+        self._roi_pct = (
+            (self.total_pnl / self.allocated_capital) * 100
+            if self.allocated_capital > 0 else 0.0
+        )
 
 
 class AgentSpawner:
@@ -76,16 +89,16 @@ class AgentSpawner:
     
     # Agent name prefixes by strategy
     STRATEGY_NAMES = {
-        Strategy.MOMENTUM: ["Swift", "Flash", "Bolt", "Rocket", "Turbo"],
-        Strategy.PUMP_GRADUATE: ["Graduate", "Scholar", "Elite", "Prime", "Alpha"],
-        Strategy.SNIPER: ["Hawk", "Eagle", "Falcon", "Viper", "Strike"],
-        Strategy.WHALE_COPY: ["Orca", "Whale", "Leviathan", "Titan", "Giant"],
-        Strategy.SENTIMENT: ["Pulse", "Vibe", "Mood", "Trend", "Wave"],
-        Strategy.GMGN_AI: ["Neural", "Synth", "Logic", "Matrix", "Cortex"],
-        Strategy.AXIOM_MIGRATION: ["Bridge", "Portal", "Gateway", "Transit", "Flux"],
-        Strategy.NOVA_JITO: ["Nova", "Star", "Comet", "Meteor", "Blaze"],
-        Strategy.ARBITRAGE: ["Arbitron", "Balance", "Delta", "Hedge", "Spread"],
-        Strategy.SCALPER: ["Quick", "Rapid", "Micro", "Nano", "Tick"],
+        Strategy.MOMENTUM: ("Swift", "Flash", "Bolt", "Rocket", "Turbo"),
+        Strategy.PUMP_GRADUATE: ("Graduate", "Scholar", "Elite", "Prime", "Alpha"),
+        Strategy.SNIPER: ("Hawk", "Eagle", "Falcon", "Viper", "Strike"),
+        Strategy.WHALE_COPY: ("Orca", "Whale", "Leviathan", "Titan", "Giant"),
+        Strategy.SENTIMENT: ("Pulse", "Vibe", "Mood", "Trend", "Wave"),
+        Strategy.GMGN_AI: ("Neural", "Synth", "Logic", "Matrix", "Cortex"),
+        Strategy.AXIOM_MIGRATION: ("Bridge", "Portal", "Gateway", "Transit", "Flux"),
+        Strategy.NOVA_JITO: ("Nova", "Star", "Comet", "Meteor", "Blaze"),
+        Strategy.ARBITRAGE: ("Arbitron", "Balance", "Delta", "Hedge", "Spread"),
+        Strategy.SCALPER: ("Quick", "Rapid", "Micro", "Nano", "Tick"),
     }
     
     def __init__(self):
@@ -93,6 +106,22 @@ class AgentSpawner:
         self.agents: Dict[str, SwarmAgent] = {}
         self.agent_counter = 0
         
+        # Running PnL across registered agents
+        self._total_pnl = 0.0
+        
+        # Treasury reference, resolved once rather than on every trade
+        self._treasury = get_treasury_agent()
+        
+        # Indexes kept in sync with self.agents for O(1) lookups; dict buckets
+        # (values unused) keep spawn order so listings are deterministic
+        self._by_status: Dict[AgentStatus, Dict[str, None]] = {s: {} for s in AgentStatus}
+        self._by_strategy: Dict[Strategy, Dict[str, None]] = {s: {} for s in Strategy}
+        
+        # Name pools resolved once instead of per spawn
+        self._strategy_names_cache: Dict[Strategy, Tuple[str, ...]] = {
+            s: self.STRATEGY_NAMES.get(s, ("Agent",)) for s in Strategy
+        }
+        
         # Configuration
         self.max_agents = SwarmConfig.MAX_AGENTS
         self.min_agents = SwarmConfig.MIN_AGENTS
@@ -107,7 +136,7 @@ class AgentSpawner:
         """Shutdown all agents"""
         self._running = False
         for agent in self.agents.values():
-            agent.status = AgentStatus.TERMINATED
+            self._set_status(agent, AgentStatus.TERMINATED)
         logger.info("Agent Spawner stopped")
     
     # =========================================================================
@@ -128,10 +157,10 @@ class AgentSpawner:
         
         # Generate unique ID and name
         self.agent_counter += 1
-        agent_id = f"agent_{uuid.uuid4().hex[:8]}"
+        agent_id = f"agent_{self.agent_counter:08x}"
         
-        names = self.STRATEGY_NAMES.get(strategy, ["Agent"])
-        name = f"{random.choice(names)}-{self.agent_counter:03d}"
+        names = self._strategy_names_cache[strategy]
+        name = f"{names[self.agent_counter % len(names)]}-{self.agent_counter:03d}"
         
         # Create agent
         agent = SwarmAgent(
@@ -142,7 +171,7 @@ class AgentSpawner:
         
         # Allocate capital from treasury
         capital = initial_capital or self.capital_per_agent
-        treasury = get_treasury_agent()
+        treasury = self._treasury
         
         allocation = await treasury.allocate_to_agent(
             agent_id=agent_id,
@@ -166,9 +195,12 @@ class AgentSpawner:
                     agent.allocated_capital = capital
                     agent.current_capital = capital
         
+        agent.refresh_metrics()
+        
         # Register agent
         self.agents[agent_id] = agent
-        agent.status = AgentStatus.ACTIVE
+        self._by_strategy[strategy][agent_id] = None
+        self._set_status(agent, AgentStatus.ACTIVE)
         
         logger.info(f"🐝 Spawned: {name} ({strategy.value}) with {agent.allocated_capital:.4f} SOL")
         
@@ -210,14 +242,16 @@ class AgentSpawner:
             return False
         
         agent = self.agents[agent_id]
-        agent.status = AgentStatus.TERMINATED
+        self._set_status(agent, AgentStatus.TERMINATED)
         
         # Return capital to treasury
         if agent.current_capital > 0:
-            treasury = get_treasury_agent()
-            await treasury.recall_from_agent(agent_id, agent.current_capital)
+            await self._treasury.recall_from_agent(agent_id, agent.current_capital)
         
         del self.agents[agent_id]
+        self._total_pnl -= agent.total_pnl
+        self._by_status[agent.status].pop(agent_id, None)
+        self._by_strategy[agent.strategy].pop(agent_id, None)
         
         logger.info(f"💀 Terminated: {agent.name} (PnL: {agent.total_pnl:.4f} SOL)")
         
@@ -228,7 +262,7 @@ class AgentSpawner:
         if agent_id not in self.agents:
             return False
         
-        self.agents[agent_id].status = AgentStatus.PAUSED
+        self._set_status(self.agents[agent_id], AgentStatus.PAUSED)
         return True
     
     async def resume_agent(self, agent_id: str) -> bool:
@@ -236,7 +270,7 @@ class AgentSpawner:
         if agent_id not in self.agents:
             return False
         
-        self.agents[agent_id].status = AgentStatus.ACTIVE
+        self._set_status(self.agents[agent_id], AgentStatus.ACTIVE)
         return True
     
     def get_agent(self, agent_id: str) -> Optional[SwarmAgent]:
@@ -245,11 +279,22 @@ class AgentSpawner:
     
     def get_active_agents(self) -> List[SwarmAgent]:
         """Get all active agents"""
-        return [a for a in self.agents.values() if a.status == AgentStatus.ACTIVE]
+        return [self.agents[i] for i in self._by_status[AgentStatus.ACTIVE]]
+    
+    @property
+    def active_agent_count(self) -> int:
+        """Number of ACTIVE agents, read from the status index"""
+        return len(self._by_status[AgentStatus.ACTIVE])
     
     def get_agents_by_strategy(self, strategy: Strategy) -> List[SwarmAgent]:
         """Get agents using a specific strategy"""
-        return [a for a in self.agents.values() if a.strategy == strategy]
+        return [self.agents[i] for i in self._by_strategy.get(strategy, ())]
+    
+    def _set_status(self, agent: SwarmAgent, status: AgentStatus):
+        """Transition an agent's status and keep the status index in sync"""
+        self._by_status[agent.status].pop(agent.agent_id, None)
+        agent.status = status
+        self._by_status[status][agent.agent_id] = None
     
     # =========================================================================
     # PERFORMANCE TRACKING
@@ -269,9 +314,11 @@ class AgentSpawner:
         
         agent = self.agents[agent_id]
         agent.total_pnl += pnl
+        self._total_pnl += pnl
         agent.current_capital += pnl
         agent.trades_today += 1
-        agent.last_trade_at = datetime.now(timezone.utc)
+        now = time.monotonic()
+        agent.last_trade_at = now
         
         if is_win:
             agent.wins += 1
@@ -280,13 +327,13 @@ class AgentSpawner:
             
             # Cooldown after consecutive losses
             if agent.losses > 0 and agent.losses % 3 == 0:
-                from datetime import timedelta
-                agent.status = AgentStatus.COOLDOWN
-                agent.cooldown_until = datetime.now(timezone.utc) + timedelta(minutes=5)
+                self._set_status(agent, AgentStatus.COOLDOWN)
+                agent.cooldown_until = now + 300.0  # 5 minutes
+        
+        agent.refresh_metrics()
         
         # Update treasury
-        treasury = get_treasury_agent()
-        await treasury.update_agent_pnl(
+        await self._treasury.update_agent_pnl(
             agent_id=agent_id,
             pnl=pnl,
             trades=1,
@@ -303,8 +350,7 @@ class AgentSpawner:
             if agent.roi_pct < min_roi and agent.trades_today >= 5:
                 to_terminate.append(agent.agent_id)
         
-        for agent_id in to_terminate:
-            await self.terminate_agent(agent_id)
+        await asyncio.gather(*(self.terminate_agent(aid) for aid in to_terminate))
         
         if to_terminate:
             logger.info(f"🧹 Pruned {len(to_terminate)} underperforming agents")
@@ -317,8 +363,7 @@ class AgentSpawner:
         """
         Auto-scale the swarm based on treasury balance
         """
-        treasury = get_treasury_agent()
-        available = treasury.bot_trading_balance
+        available = self._treasury.bot_trading_balance
         current_count = len(self.agents)
         
         # Scale up if capital available
@@ -331,14 +376,11 @@ class AgentSpawner:
             
             if agents_to_spawn > 0:
                 # Pick strategies for new agents
-                strategies = list(Strategy)
-                for _ in range(agents_to_spawn):
-                    strategy = random.choice(strategies)
+                for strategy in random.choices(_ALL_STRATEGIES, k=agents_to_spawn):
                     await self.spawn_agent(strategy)
         
         # Scale down if losses accumulating
-        total_pnl = sum(a.total_pnl for a in self.agents.values())
-        if total_pnl < -0.1 and current_count > self.min_agents:
+        if self._total_pnl < -0.1 and current_count > self.min_agents:
             await self.prune_underperformers()
     
     # =========================================================================
@@ -359,18 +401,16 @@ class AgentSpawner:
                 "total_pnl": 0
             }
         
-        active = [a for a in agents if a.status == AgentStatus.ACTIVE]
-        total_capital = sum(a.current_capital for a in agents)
-        total_pnl = sum(a.total_pnl for a in agents)
-        total_trades = sum(a.trades_today for a in agents)
-        total_wins = sum(a.wins for a in agents)
+        total_capital = sum(map(attrgetter("current_capital"), agents))
+        total_trades = sum(map(attrgetter("trades_today"), agents))
+        total_wins = sum(map(attrgetter("wins"), agents))
         
         return {
             "total_agents": len(agents),
-            "active_agents": len(active),
-            "paused_agents": len([a for a in agents if a.status == AgentStatus.PAUSED]),
+            "active_agents": self.active_agent_count,
+            "paused_agents": len(self._by_status[AgentStatus.PAUSED]),
             "total_capital": total_capital,
-            "total_pnl": total_pnl,
+            "total_pnl": self._total_pnl,
             "total_trades": total_trades,
             "overall_win_rate": (total_wins / total_trades * 100) if total_trades > 0 else 0,
             "best_agent": max(agents, key=lambda a: a.total_pnl).name if agents else None,
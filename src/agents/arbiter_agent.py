@@ -5,10 +5,20 @@ Makes final buy/sell decisions based on all available intelligence.
 
 import asyncio
 import logging
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import Deque, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to plain NumPy
+    njit = None
+    prange = range
+
 from src.types import (
     TokenInfo, RugCheckResult, SentimentResult,
     TradeSignal, TradeAction, Position
@@ -20,8 +30,102 @@ from src.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Top-10 holder concentration ladder: >40% → -5, >60% → -15, >80% → -30
+_HOLDER_THRESHOLDS = (40.0, 60.0, 80.0)
+_HOLDER_PENALTIES = (0.0, 5.0, 15.0, 30.0)
+_HOLDER_THRESHOLDS_NP = np.array(_HOLDER_THRESHOLDS)
+_HOLDER_PENALTIES_NP = np.array(_HOLDER_PENALTIES)
+
+
+def _score_kernel(
+    p5, p1h, vol, liq,
+    has_sent, sent_overall, sent_mentions, sent_trending,
+    has_rc, honeypot, hp_score, mintable, freezable, top10,
+    w_safety, w_sentiment, w_momentum
+):
+    """
+    Per-token safety, sentiment, momentum and weighted scores.
+    
+    Loop form of ArbiterAgent._calculate_batch_scores, compiled with numba
+    when it is installed.
+    """
+    n = p5.shape[0]
+    safety = np.empty(n)
+    sentiment = np.empty(n)
+    momentum = np.empty(n)
+    weighted = np.empty(n)
+    
+    for i in prange(n):
+        # Safety
+        if has_rc[i] and not honeypot[i]:
+            s = 100.0 - hp_score[i] * 30.0 - 20.0 * mintable[i] - 15.0 * freezable[i]
+            if top10[i] > 80.0:
+                s -= 30.0
+            elif top10[i] > 60.0:
+                s -= 15.0
+            elif top10[i] > 40.0:
+                s -= 5.0
+            safety[i] = min(max(s, 0.0), 100.0)
+        else:
+            safety[i] = 0.0
+        
+        # Sentiment
+        if has_sent[i]:
+            s = (sent_overall[i] + 10.0) * 5.0
+            if sent_mentions[i] > 100:
+                s += 10.0
+            elif sent_mentions[i] > 50:
+                s += 5.0
+            if sent_trending[i]:
+                s += 15.0
+            sentiment[i] = min(max(s, 0.0), 100.0)
+        else:
+            sentiment[i] = 50.0
+        
+        # Momentum
+        m = 50.0
+        if p5[i] > 10:
+            m += 20.0
+        elif p5[i] > 5:
+            m += 10.0
+        elif p5[i] < -10:
+            m -= 20.0
+        elif p5[i] < -5:
+            m -= 10.0
+        if p1h[i] > 20:
+            m += 15.0
+        elif p1h[i] > 10:
+            m += 8.0
+        elif p1h[i] < -20:
+            m -= 15.0
+        elif p1h[i] < -10:
+            m -= 8.0
+        if vol[i] > 100000:
+            m += 10.0
+        elif vol[i] > 50000:
+            m += 5.0
+        if liq[i] > 50000:
+            m += 5.0
+        elif liq[i] < 10000:
+            m -= 10.0
+        momentum[i] = min(max(m, 0.0), 100.0)
+        
+        weighted[i] = (
+            safety[i] * w_safety +
+            sentiment[i] * w_sentiment +
+            momentum[i] * w_momentum
+        )
+    
+    return safety, sentiment, momentum, weighted
+
 
-@dataclass
+# fastmath is left off so results stay bit-identical to the scalar scorers
+_score_kernel_jit = (
+    njit(parallel=True, cache=True)(_score_kernel) if njit is not None else None
+)
+
+
+@dataclass(slots=True)
 class TokenAnalysis:
     """Complete analysis for a token"""
     token: TokenInfo
@@ -58,8 +162,7 @@ class ArbiterAgent:
     
     def __init__(self, strategy: Strategy = None):
         self.strategy = strategy or ACTIVE_STRATEGY
-        self.pending_signals: List[TradeSignal] = []
-        self.signal_history: List[TradeSignal] = []
+        self.signal_history: Deque[TradeSignal] = deque(maxlen=10_000)
         self._running = False
         
         # Decision thresholds
@@ -95,6 +198,10 @@ class ArbiterAgent:
             sentiment=sentiment
         )
         
+        # 0. Cheap rejections first - skip scoring tokens that can't trade
+        if not self._passes_prechecks(analysis):
+            return analysis
+        
         # 1. Safety Score (0-100)
         analysis.safety_score = self._calculate_safety_score(rug_check)
         
@@ -163,7 +270,6 @@ class ArbiterAgent:
             strategy=self.strategy.value
         )
         
-        self.pending_signals.append(signal)
         self.signal_history.append(signal)
         
         action_emoji = "🟢" if action == TradeAction.BUY else "🔴"
@@ -187,6 +293,75 @@ class ArbiterAgent:
         analysis = await self.evaluate_token(token, rug_check, sentiment)
         return await self.generate_signal(analysis, existing_position)
     
+    async def evaluate_batch(
+        self,
+        tokens: List[TokenInfo],
+        rug_checks: Optional[Dict[str, RugCheckResult]] = None,
+        sentiments: Optional[Dict[str, SentimentResult]] = None
+    ) -> List[TokenAnalysis]:
+        """
+        Evaluate many tokens at once, scoring them with vectorized NumPy math.
+        
+        Produces the same analyses as calling evaluate_token per token;
+        rug_checks and sentiments are keyed by mint.
+        """
+        if not tokens:
+            return []
+        
+        rug_checks = rug_checks or {}
+        sentiments = sentiments or {}
+        
+        analyses = [
+            TokenAnalysis(
+                token=t,
+                rug_check=rug_checks.get(t.mint),
+                sentiment=sentiments.get(t.mint)
+            )
+            for t in tokens
+        ]
+        
+        # Only score tokens that survive the cheap rejections
+        candidates = [a for a in analyses if self._passes_prechecks(a)]
+        if not candidates:
+            return analyses
+        
+        safety, sentiment, momentum, weighted = self._calculate_batch_scores(
+            [a.token for a in candidates],
+            [a.rug_check for a in candidates],
+            [a.sentiment for a in candidates],
+            self._get_score_weights()
+        )
+        
+        for i, analysis in enumerate(candidates):
+            analysis.safety_score = float(safety[i])
+            analysis.sentiment_score = float(sentiment[i])
+            analysis.momentum_score = float(momentum[i])
+            strategy_multiplier = self._get_strategy_multiplier(analysis.token, analysis)
+            analysis.overall_score = float(weighted[i]) * strategy_multiplier
+            analysis.is_tradeable = self._is_tradeable(analysis)
+        
+        return analyses
+    
+    async def evaluate_and_signal_batch(
+        self,
+        tokens: List[TokenInfo],
+        rug_checks: Optional[Dict[str, RugCheckResult]] = None,
+        sentiments: Optional[Dict[str, SentimentResult]] = None,
+        existing_positions: Optional[Dict[str, Position]] = None
+    ) -> List[Optional[TradeSignal]]:
+        """
+        Batch counterpart of evaluate_and_signal: one vectorized scoring pass
+        via evaluate_batch, then a signal (or None) per token, in order.
+        All mappings are keyed by mint.
+        """
+        existing_positions = existing_positions or {}
+        analyses = await self.evaluate_batch(tokens, rug_checks, sentiments)
+        
+        return [
+            await self.generate_signal(analysis, existing_positions.get(analysis.token.mint))
+            for analysis in analyses
+        ]
+    
     # =========================================================================
     # SCORING CALCULATIONS
     # =========================================================================
@@ -198,33 +373,95 @@ class ArbiterAgent:
         if not rug_check:
             return 0.0  # No data = assume unsafe
         
-        score = 100.0
-        
-        # Honeypot detection (-50 if detected)
+        # Honeypot detection
         if rug_check.is_honeypot:
             return 0.0  # Immediate fail
         
-        # Honeypot score penalty
-        score -= rug_check.honeypot_score * 30
-        
-        # Mint authority (-20 if not revoked)
-        if rug_check.is_mintable:
-            score -= 20
-        
-        # Freeze authority (-15 if not revoked)
-        if rug_check.is_freezable:
-            score -= 15
+        # Honeypot score penalty, mint authority (-20), freeze authority (-15)
+        score = (
+            100.0
+            - rug_check.honeypot_score * 30
+            - 20 * rug_check.is_mintable
+            - 15 * rug_check.is_freezable
+        )
         
         # Top holder concentration
-        if rug_check.top10_holder_pct > 80:
-            score -= 30
-        elif rug_check.top10_holder_pct > 60:
-            score -= 15
-        elif rug_check.top10_holder_pct > 40:
-            score -= 5
+        score -= _HOLDER_PENALTIES[bisect_left(_HOLDER_THRESHOLDS, rug_check.top10_holder_pct)]
         
         return max(0.0, min(100.0, score))
     
+    def _calculate_batch_scores(
+        self,
+        tokens: List[TokenInfo],
+        rug_checks: List[Optional[RugCheckResult]],
+        sentiments: List[Optional[SentimentResult]],
+        weights: Dict[str, float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized safety, sentiment and momentum scores (0-100) for a batch,
+        plus their weighted sum.
+        
+        Mirrors the scalar _calculate_*_score ladders element-wise. Uses the
+        numba kernel when available, NumPy mask arithmetic otherwise.
+        """
+        n = len(tokens)
+        
+        # Column arrays of the scoring inputs
+        has_rc = np.fromiter((rc is not None for rc in rug_checks), bool, n)
+        honeypot = np.fromiter((rc is not None and rc.is_honeypot for rc in rug_checks), bool, n)
+        hp_score = np.fromiter((rc.honeypot_score if rc else 0.0 for rc in rug_checks), float, n)
+        mintable = np.fromiter((rc is not None and rc.is_mintable for rc in rug_checks), bool, n)
+        freezable = np.fromiter((rc is not None and rc.is_freezable for rc in rug_checks), bool, n)
+        top10 = np.fromiter((rc.top10_holder_pct if rc else 0.0 for rc in rug_checks), float, n)
+        
+        has_sent = np.fromiter((s is not None for s in sentiments), bool, n)
+        overall = np.fromiter((s.overall_score if s else 0.0 for s in sentiments), float, n)
+        mentions = np.fromiter((s.total_mentions if s else 0 for s in sentiments), float, n)
+        trending = np.fromiter((s is not None and s.is_trending for s in sentiments), bool, n)
+        
+        p5 = np.fromiter((t.price_change_5m for t in tokens), float, n)
+        p1h = np.fromiter((t.price_change_1h for t in tokens), float, n)
+        vol = np.fromiter((t.volume_24h_usd for t in tokens), float, n)
+        liq = np.fromiter((t.liquidity_usd for t in tokens), float, n)
+        
+        if _score_kernel_jit is not None:
+            return _score_kernel_jit(
+                p5, p1h, vol, liq,
+                has_sent, overall, mentions, trending,
+                has_rc, honeypot, hp_score, mintable, freezable, top10,
+                weights["safety"], weights["sentiment"], weights["momentum"]
+            )
+        
+        # Safety
+        safety = 100.0 - hp_score * 30 - 20 * mintable - 15 * freezable
+        safety -= _HOLDER_PENALTIES_NP[np.searchsorted(_HOLDER_THRESHOLDS_NP, top10, side="left")]
+        safety = np.where(has_rc & ~honeypot, np.clip(safety, 0.0, 100.0), 0.0)
+        
+        # Sentiment
+        sentiment = (overall + 10) * 5
+        sentiment += np.select([mentions > 100, mentions > 50], [10.0, 5.0], 0.0)
+        sentiment += 15.0 * trending
+        sentiment = np.where(has_sent, np.clip(sentiment, 0.0, 100.0), 50.0)
+        
+        # Momentum
+        momentum = 50.0 + np.select(
+            [p5 > 10, p5 > 5, p5 < -10, p5 < -5], [20.0, 10.0, -20.0, -10.0], 0.0
+        )
+        momentum += np.select(
+            [p1h > 20, p1h > 10, p1h < -20, p1h < -10], [15.0, 8.0, -15.0, -8.0], 0.0
+        )
+        momentum += np.select([vol > 100000, vol > 50000], [10.0, 5.0], 0.0)
+        momentum += np.select([liq > 50000, liq < 10000], [5.0, -10.0], 0.0)
+        momentum = np.clip(momentum, 0.0, 100.0)
+        
+        weighted = (
+            safety * weights["safety"] +
+            sentiment * weights["sentiment"] +
+            momentum * weights["momentum"]
+        )
+        
+        return safety, sentiment, momentum, weighted
+    
     def _calculate_sentiment_score(self, sentiment: Optional[SentimentResult]) -> float:
         """
         Calculate sentiment score (0-100) from social analysis
@@ -313,19 +550,19 @@ class ArbiterAgent:
         """
         multiplier = 1.0
         
-        if self.strategy == Strategy.MOMENTUM:
+        if self.strategy is Strategy.MOMENTUM:
             # Boost for strong short-term momentum
             if token.price_change_5m > 15:
                 multiplier = 1.2
                 analysis.reasons.append("Strong 5m momentum")
         
-        elif self.strategy == Strategy.PUMP_GRADUATE:
+        elif self.strategy is Strategy.PUMP_GRADUATE:
             # Boost for tokens graduating from pump.fun
             if token.market_cap_usd > 50000 and token.liquidity_usd > 20000:
                 multiplier = 1.15
                 analysis.reasons.append("Pump.fun graduate candidate")
         
-        elif self.strategy == Strategy.SENTIMENT:
+        elif self.strategy is Strategy.SENTIMENT:
             # Boost for viral sentiment
             if analysis.sentiment and analysis.sentiment.is_trending:
                 multiplier = 1.25
@@ -378,9 +615,9 @@ class ArbiterAgent:
         
         return TradeAction.HOLD
     
-    def _is_tradeable(self, analysis: TokenAnalysis) -> bool:
+    def _passes_prechecks(self, analysis: TokenAnalysis) -> bool:
         """
-        Final check if token is tradeable
+        Cheap tradeability checks that don't need any scoring
         """
         # Must have rug check
         if not analysis.rug_check:
@@ -397,6 +634,12 @@ class ArbiterAgent:
             analysis.reasons.append("Liquidity too low")
             return False
         
+        return True
+    
+    def _is_tradeable(self, analysis: TokenAnalysis) -> bool:
+        """
+        Final check if a pre-screened, scored token is tradeable
+        """
         # Must meet overall score threshold
         if analysis.overall_score < self.min_overall_score:
             analysis.reasons.append(f"Score {analysis.overall_score:.0f} < {self.min_overall_score}")
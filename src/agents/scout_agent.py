@@ -6,12 +6,20 @@ Monitors multiple sources for new token opportunities.
 import asyncio
 import aiohttp
 import logging
+import orjson
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 
 from src.types import TokenInfo, RugCheckResult
+from src.services.http_session import get_shared_session
+from src.services.circuit_breaker import CircuitBreaker
 from src.constants import (
-    DEXSCREENER_API, DEXSCREENER_PAIRS_URL,
+    DEXSCREENER_API, DEXSCREENER_PAIRS_URL, DEXSCREENER_SEARCH_URL,
     RUGCHECK_API, RUGCHECK_TOKEN_URL,
     PUMPFUN_API, PUMPFUN_COINS_URL,
     TradingThresholds, PAPER_TRADING
@@ -19,6 +27,14 @@ from src.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Upstream statuses worth retrying (rate limits and transient server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_MAX_DELAY_SECS = 30.0
+
+# RugCheck risk levels that flag a honeypot vs. an active mint/freeze authority
+HONEYPOT_DANGER_LEVELS = frozenset({"danger", "high"})
+AUTHORITY_DANGER_LEVELS = frozenset({"danger", "warning"})
+
 
 class ScoutAgent:
     """
@@ -30,25 +46,36 @@ class ScoutAgent:
     - RugCheck (security analysis)
     """
     
+    # RugCheck result cache
+    VET_TTL_SECS = 60
+    VET_CACHE_MAX_SIZE = 4096
+    
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
         self.discovered_tokens: Dict[str, TokenInfo] = {}
         self.vetted_tokens: Dict[str, RugCheckResult] = {}
         self._running = False
+        
+        # mint -> (time.monotonic() when fetched, result), oldest first
+        self._vet_cache: OrderedDict[str, Tuple[float, RugCheckResult]] = OrderedDict()
+        
+        # Caps simultaneous RugCheck requests
+        self._vet_sem = asyncio.Semaphore(TradingThresholds.MAX_VET_CONCURRENCY)
+        
+        # One circuit breaker per upstream host
+        self._breakers: Dict[str, CircuitBreaker] = {}
     
     async def start(self):
         """Initialize the scout agent"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        self.session = await get_shared_session()
         self._running = True
         logger.info("🔭 Scout Agent initialized")
     
     async def stop(self):
         """Shutdown the scout agent"""
         self._running = False
-        if self.session:
-            await self.session.close()
+        # The shared session outlives the agent; it is closed at app shutdown
+        self.session = None
         logger.info("Scout Agent stopped")
     
     # =========================================================================
@@ -62,25 +89,22 @@ class ScoutAgent:
         tokens = []
         
         try:
-            url = f"{DEXSCREENER_API}/search?q=solana"
+            url = f"{DEXSCREENER_SEARCH_URL}?q=solana"
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    pairs = data.get("pairs", [])[:limit]
+            data = await self._get_json_with_retry(url, "DexScreener")
+            if data is not None:
+                for pair in data.get("pairs") or ():
+                    if pair.get("chainId") != "solana":
+                        continue
                     
-                    for pair in pairs:
-                        if pair.get("chainId") != "solana":
-                            continue
-                        
-                        token = self._parse_dexscreener_pair(pair)
-                        if token and self._passes_initial_filter(token):
-                            tokens.append(token)
-                            self.discovered_tokens[token.mint] = token
-                    
-                    logger.info(f"📡 DexScreener: Found {len(tokens)} potential tokens")
-                else:
-                    logger.warning(f"DexScreener API returned {response.status}")
+                    token = self._parse_dexscreener_pair(pair)
+                    if token and self._passes_initial_filter(token):
+                        tokens.append(token)
+                        self.discovered_tokens[token.mint] = token
+                        if len(tokens) >= limit:
+                            break
+                
+                logger.info(f"📡 DexScreener: Found {len(tokens)} potential tokens")
         
         except Exception as e:
             logger.error(f"DexScreener discovery error: {e}")
@@ -96,20 +120,17 @@ class ScoutAgent:
         try:
             url = f"{PUMPFUN_COINS_URL}?limit={limit}&sort=created_timestamp&order=desc"
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    coins = data if isinstance(data, list) else data.get("coins", [])
-                    
-                    for coin in coins[:limit]:
-                        token = self._parse_pumpfun_coin(coin)
-                        if token:
-                            tokens.append(token)
-                            self.discovered_tokens[token.mint] = token
-                    
-                    logger.info(f"🎯 Pump.fun: Found {len(tokens)} new launches")
-                else:
-                    logger.warning(f"Pump.fun API returned {response.status}")
+            data = await self._get_json_with_retry(url, "Pump.fun")
+            if data is not None:
+                coins = data if isinstance(data, list) else data.get("coins", [])
+                
+                for coin in coins[:limit]:
+                    token = self._parse_pumpfun_coin(coin)
+                    if token:
+                        tokens.append(token)
+                        self.discovered_tokens[token.mint] = token
+                
+                logger.info(f"🎯 Pump.fun: Found {len(tokens)} new launches")
         
         except Exception as e:
             logger.error(f"Pump.fun discovery error: {e}")
@@ -126,21 +147,89 @@ class ScoutAgent:
             # DexScreener trending
             url = f"{DEXSCREENER_API}/tokens/trending"
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    for item in data[:limit]:
-                        if item.get("chainId") == "solana":
-                            token = self._parse_dexscreener_pair(item)
-                            if token:
-                                tokens.append(token)
+            data = await self._get_json_with_retry(url, "DexScreener")
+            if data is not None:
+                for item in data[:limit]:
+                    if item.get("chainId") == "solana":
+                        token = self._parse_dexscreener_pair(item)
+                        if token:
+                            tokens.append(token)
         
         except Exception as e:
             logger.error(f"Trending fetch error: {e}")
         
         return tokens
     
+    async def _get_json_with_retry(
+        self,
+        url: str,
+        source: str,
+        max_tries: int = 4,
+        base: float = 0.25
+    ) -> Optional[Any]:
+        """
+        GET a JSON payload, retrying rate limits and transient failures
+        with full-jitter exponential backoff. Returns None on failure, or
+        immediately while the host's circuit breaker is open.
+        """
+        breaker = self._breaker_for(url)
+        if not breaker.allow_request():
+            logger.debug(f"{source} skipped: circuit open")
+            return None
+        
+        failure = ""
+        
+        for attempt in range(max_tries):
+            retry_after = None
+            
+            try:
+                async with self.session.get(url) as response:
+                    if response.status == 200:
+                        body = await response.read()
+                        breaker.on_success()
+                        try:
+                            return orjson.loads(body)
+                        except orjson.JSONDecodeError as e:
+                            logger.warning(f"{source} returned invalid JSON: {e}")
+                            return None
+                    
+                    if response.status not in RETRY_STATUSES:
+                        # Auth / bad request / not found - retrying won't help,
+                        # but the host is up
+                        breaker.on_success()
+                        logger.warning(f"{source} API returned {response.status}")
+                        return None
+                    
+                    failure = f"HTTP {response.status}"
+                    retry_after = response.headers.get("Retry-After")
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failure = str(e) or type(e).__name__
+            
+            if attempt == max_tries - 1:
+                break
+            
+            delay = random.uniform(0, base * 2 ** attempt)
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass  # HTTP-date form; fall back to backoff
+            
+            await asyncio.sleep(min(delay, RETRY_MAX_DELAY_SECS))
+        
+        breaker.on_failure()
+        logger.warning(f"{source} request failed after {max_tries} attempts ({failure})")
+        return None
+    
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for a URL's host"""
+        host = urlsplit(url).hostname or url
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+    
     # =========================================================================
     # SECURITY VETTING
     # =========================================================================
@@ -149,21 +238,25 @@ class ScoutAgent:
         """
         Perform security analysis using RugCheck API
         """
+        cached = self._get_cached_vet(mint)
+        if cached:
+            return cached
+        
         result = RugCheckResult(mint=mint)
         
         try:
             url = f"{RUGCHECK_TOKEN_URL}/{mint}/report"
             
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result = self._parse_rugcheck_response(mint, data)
-                    self.vetted_tokens[mint] = result
-                    
-                    status = "✅ SAFE" if result.passes_safety_check else "⚠️ RISKY"
-                    logger.info(f"🔍 RugCheck {mint[:8]}...: {status} (score: {result.honeypot_score:.2f})")
-                else:
-                    logger.warning(f"RugCheck returned {response.status} for {mint[:8]}...")
+            async with self._vet_sem:
+                data = await self._get_json_with_retry(url, f"RugCheck ({mint[:8]}...)")
+            
+            if data is not None:
+                result = self._parse_rugcheck_response(mint, data)
+                self.vetted_tokens[mint] = result
+                self._cache_vet(mint, result)
+                
+                status = "✅ SAFE" if result.passes_safety_check else "⚠️ RISKY"
+                logger.info(f"🔍 RugCheck {mint[:8]}...: {status} (score: {result.honeypot_score:.2f})")
         
         except Exception as e:
             logger.error(f"RugCheck error for {mint[:8]}...: {e}")
@@ -172,13 +265,21 @@ class ScoutAgent:
     
     async def vet_multiple(self, mints: List[str]) -> Dict[str, RugCheckResult]:
         """
-        Vet multiple tokens concurrently
+        Vet multiple tokens concurrently (capped by MAX_VET_CONCURRENCY)
         """
-        tasks = [self.vet_token(mint) for mint in mints]
+        vetted = {}
+        to_fetch = []
+        for mint in mints:
+            cached = self._get_cached_vet(mint)
+            if cached:
+                vetted[mint] = cached
+            else:
+                to_fetch.append(mint)
+        
+        tasks = [self.vet_token(mint) for mint in to_fetch]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        vetted = {}
-        for mint, result in zip(mints, results):
+        for mint, result in zip(to_fetch, results):
             if isinstance(result, RugCheckResult):
                 vetted[mint] = result
             else:
@@ -186,6 +287,27 @@ class ScoutAgent:
         
         return vetted
     
+    def _get_cached_vet(self, mint: str) -> Optional[RugCheckResult]:
+        """Return a cached RugCheck result if it is still fresh"""
+        entry = self._vet_cache.get(mint)
+        if entry is None:
+            return None
+        
+        fetched_at, result = entry
+        if time.monotonic() - fetched_at >= self.VET_TTL_SECS:
+            del self._vet_cache[mint]
+            return None
+        
+        self._vet_cache.move_to_end(mint)
+        return result
+    
+    def _cache_vet(self, mint: str, result: RugCheckResult):
+        """Store a RugCheck result, evicting the least recently used entry"""
+        self._vet_cache[mint] = (time.monotonic(), result)
+        self._vet_cache.move_to_end(mint)
+        if len(self._vet_cache) > self.VET_CACHE_MAX_SIZE:
+            self._vet_cache.popitem(last=False)
+    
     # =========================================================================
     # COMBINED DISCOVERY FLOW
     # =========================================================================
@@ -201,14 +323,20 @@ class ScoutAgent:
         """
         all_tokens = []
         
-        # Discover from sources
-        if "dexscreener" in sources:
-            tokens = await self.discover_dexscreener_pairs(limit_per_source)
-            all_tokens.extend(tokens)
+        # Discover from sources concurrently (skipping any whose circuit is open)
+        coros = []
+        if "dexscreener" in sources and not self._breaker_for(DEXSCREENER_API).is_open:
+            coros.append(self.discover_dexscreener_pairs(limit_per_source))
         
-        if "pumpfun" in sources:
-            tokens = await self.discover_pumpfun_launches(limit_per_source)
-            all_tokens.extend(tokens)
+        if "pumpfun" in sources and not self._breaker_for(PUMPFUN_API).is_open:
+            coros.append(self.discover_pumpfun_launches(limit_per_source))
+        
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Discovery source error: {result}")
+            else:
+                all_tokens.extend(result)
         
         if not all_tokens:
             return []
@@ -219,16 +347,13 @@ class ScoutAgent:
         if not vet_all:
             return list(unique_tokens.values())
         
-        # Vet all tokens
-        mints = list(unique_tokens.keys())
-        vet_results = await self.vet_multiple(mints)
-        
-        # Filter to safe tokens
+        # Vet all tokens, keeping safe ones as each RugCheck call returns
+        # (vet_token handles the cache and concurrency cap)
         safe_tokens = []
-        for mint, token in unique_tokens.items():
-            vet_result = vet_results.get(mint)
-            if vet_result and vet_result.passes_safety_check:
-                safe_tokens.append(token)
+        for coro in asyncio.as_completed([self.vet_token(m) for m in unique_tokens]):
+            vet_result = await coro
+            if vet_result.passes_safety_check:
+                safe_tokens.append(unique_tokens[vet_result.mint])
         
         logger.info(f"🎯 Discovery complete: {len(safe_tokens)}/{len(unique_tokens)} passed vetting")
         
@@ -241,7 +366,14 @@ class ScoutAgent:
     def _parse_dexscreener_pair(self, pair: Dict[str, Any]) -> Optional[TokenInfo]:
         """Parse DexScreener pair data into TokenInfo"""
         try:
-            base_token = pair.get("baseToken", {})
+            # Resolve nested sections once
+            base_token = pair.get("baseToken") or {}
+            liquidity = pair.get("liquidity") or {}
+            volume = pair.get("volume") or {}
+            price_change = pair.get("priceChange") or {}
+            info = pair.get("info") or {}
+            websites = info.get("websites") or ()
+            socials = info.get("socials") or ()
             
             return TokenInfo(
                 mint=base_token.get("address", ""),
@@ -250,14 +382,14 @@ class ScoutAgent:
                 price_usd=float(pair.get("priceUsd", 0) or 0),
                 price_sol=float(pair.get("priceNative", 0) or 0),
                 market_cap_usd=float(pair.get("marketCap", 0) or 0),
-                liquidity_usd=float(pair.get("liquidity", {}).get("usd", 0) or 0),
-                volume_24h_usd=float(pair.get("volume", {}).get("h24", 0) or 0),
-                price_change_5m=float(pair.get("priceChange", {}).get("m5", 0) or 0),
-                price_change_1h=float(pair.get("priceChange", {}).get("h1", 0) or 0),
-                price_change_24h=float(pair.get("priceChange", {}).get("h24", 0) or 0),
-                image_url=pair.get("info", {}).get("imageUrl"),
-                website=pair.get("info", {}).get("websites", [{}])[0].get("url") if pair.get("info", {}).get("websites") else None,
-                twitter=pair.get("info", {}).get("socials", [{}])[0].get("url") if pair.get("info", {}).get("socials") else None,
+                liquidity_usd=float(liquidity.get("usd", 0) or 0),
+                volume_24h_usd=float(volume.get("h24", 0) or 0),
+                price_change_5m=float(price_change.get("m5", 0) or 0),
+                price_change_1h=float(price_change.get("h1", 0) or 0),
+                price_change_24h=float(price_change.get("h24", 0) or 0),
+                image_url=info.get("imageUrl"),
+                website=websites[0].get("url") if websites else None,
+                twitter=socials[0].get("url") if socials else None,
             )
         except Exception as e:
             logger.debug(f"Parse error: {e}")
@@ -293,16 +425,17 @@ class ScoutAgent:
         for risk in risks:
             name = risk.get("name", "").lower()
             level = risk.get("level", "").lower()
+            authority_danger = level in AUTHORITY_DANGER_LEVELS
             
             if "honeypot" in name:
-                is_honeypot = level in ["danger", "high"]
+                is_honeypot = level in HONEYPOT_DANGER_LEVELS
                 honeypot_score = 0.9 if is_honeypot else 0.3
             
-            if "mint" in name and "authority" in name:
-                is_mintable = level in ["danger", "warning"]
-            
             if "freeze" in name:
-                is_freezable = level in ["danger", "warning"]
+                is_freezable = authority_danger
+            
+            if "mint" in name and "authority" in name:
+                is_mintable = authority_danger
         
         token_meta = data.get("tokenMeta", {})
         
@@ -334,12 +467,7 @@ class ScoutAgent:
 
 
 # Singleton instance
-_scout_agent: Optional[ScoutAgent] = None
-
-
+@lru_cache(maxsize=None)
 def get_scout_agent() -> ScoutAgent:
     """Get or create the scout agent singleton"""
-    global _scout_agent
-    if _scout_agent is None:
-        _scout_agent = ScoutAgent()
-    return _scout_agent
+    return ScoutAgent()
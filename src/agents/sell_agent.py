@@ -5,14 +5,29 @@ Monitors positions and executes exits based on risk parameters.
 
 import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Deque, List, Optional, Dict
+
+import numpy as np
 
 from src.types import Position, TradeSignal, TradeAction, TokenInfo
 from src.constants import TradingThresholds
 
 logger = logging.getLogger(__name__)
 
+# Exit stat keys and the reason text that marks them
+EXIT_CATEGORIES = (
+    ("stop_losses", "stop loss"),
+    ("take_profits", "take profit"),
+    ("timeouts", "timeout"),
+    ("emergencies", "emergency"),
+)
+
+# Reasons attached to every emergency exit signal (each signal gets its own list)
+_EMERGENCY_REASONS = ("Emergency exit triggered",)
+
 
 class SellAgent:
     """
@@ -24,13 +39,18 @@ class SellAgent:
     - Sentiment reversal
     """
     
+    # Books at least this large are pre-screened with vectorized masks
+    VECTORIZE_MIN_POSITIONS = 32
+    
     def __init__(self):
         self._running = False
-        self.exit_signals: List[TradeSignal] = []
+        self.exit_signals: Deque[TradeSignal] = deque(maxlen=10_000)
+        self._exit_counts: Counter = Counter()  # All-time, survives history eviction
         
         # Configuration
         self.check_interval_secs = 10
         self.position_timeout_mins = TradingThresholds.POSITION_TIMEOUT_MINS
+        self._timeout_secs = self.position_timeout_mins * 60.0
     
     async def start(self):
         """Initialize the sell agent"""
@@ -55,25 +75,70 @@ class SellAgent:
         Check all positions and generate exit signals where needed
         """
         exit_signals = []
+        now = time.monotonic()
         
+        # Update current prices
         for position in positions:
-            # Update current price
             current_price = current_prices.get(position.mint, position.current_price)
             position.update_pnl(current_price)
-            
+        
+        # On large books, only positions that trip a condition get evaluated
+        if len(positions) >= self.VECTORIZE_MIN_POSITIONS:
+            candidates = [positions[i] for i in self._exit_candidates(positions, now)]
+        else:
+            candidates = positions
+        
+        for position in candidates:
             # Check exit conditions
-            signal = await self._evaluate_position(position)
+            signal = await self._evaluate_position(position, now)
             
             if signal:
                 exit_signals.append(signal)
-                self.exit_signals.append(signal)
+                self._record_exit(signal)
         
         return exit_signals
     
-    async def _evaluate_position(self, position: Position) -> Optional[TradeSignal]:
+    def _exit_candidates(self, positions: List[Position], now: float) -> np.ndarray:
+        """
+        Indices of positions hitting stop loss, take profit, timeout or the
+        emergency threshold, computed as Structure-of-Arrays masks
+        """
+        n = len(positions)
+        current = np.fromiter((p.current_price for p in positions), float, n)
+        stop_loss = np.fromiter((p.stop_loss_price for p in positions), float, n)
+        take_profit = np.fromiter((p.take_profit_price for p in positions), float, n)
+        pnl_pct = np.fromiter((p.unrealized_pnl_pct for p in positions), float, n)
+        opened = np.fromiter((p.opened_at_monotonic for p in positions), float, n)
+        
+        hit = (
+            (current <= stop_loss) |
+            (current >= take_profit) |
+            (now - opened > self._timeout_secs) |
+            (pnl_pct <= -25)
+        )
+        return np.flatnonzero(hit)
+    
+    def _record_exit(self, signal: TradeSignal):
+        """Add an exit signal to history and the running stats"""
+        self.exit_signals.append(signal)
+        
+        text = "\n".join(signal.reasons).lower()
+        self._exit_counts["total"] += 1
+        self._exit_counts.update(key for key, needle in EXIT_CATEGORIES if needle in text)
+    
+    async def _evaluate_position(
+        self,
+        position: Position,
+        now: Optional[float] = None
+    ) -> Optional[TradeSignal]:
         """
         Evaluate a single position for exit conditions
+        
+        `now` (time.monotonic()) lets a sweep over many positions share one timestamp.
         """
+        if now is None:
+            now = time.monotonic()
+        
         reasons = []
         should_exit = False
         
@@ -88,8 +153,7 @@ class SellAgent:
             should_exit = True
         
         # 3. Time-based Expiry
-        position_age = datetime.now(timezone.utc) - position.opened_at
-        if position_age > timedelta(minutes=self.position_timeout_mins):
+        if now - position.opened_at_monotonic > self._timeout_secs:
             reasons.append(f"Position timeout ({self.position_timeout_mins}m)")
             should_exit = True
         
@@ -136,12 +200,8 @@ class SellAgent:
         """
         Update trailing stop based on highest price reached
         """
-        # Track highest price (would need to store this)
-        highest_price = getattr(position, '_highest_price', position.entry_price)
-        
-        if position.current_price > highest_price:
-            highest_price = position.current_price
-            position._highest_price = highest_price
+        if position.current_price > position.highest_price:
+            highest_price = position.highest_price = position.current_price
             
             # Update stop loss to trail
             new_stop = highest_price * (1 - trail_pct / 100)
@@ -155,19 +215,29 @@ class SellAgent:
     # BATCH OPERATIONS
     # =========================================================================
     
-    async def emergency_exit_all(self, positions: List[Position]) -> List[TradeSignal]:
+    async def emergency_exit_all(
+        self,
+        positions: List[Position],
+        token_cache: Optional[Dict[str, TokenInfo]] = None
+    ) -> List[TradeSignal]:
         """
         Generate exit signals for all positions (emergency mode)
+        
+        `token_cache` (mint -> TokenInfo) lets callers reuse tokens they
+        already hold instead of building one per position.
         """
         signals = []
+        token_cache = token_cache or {}
         
         for position in positions:
-            token = TokenInfo(
-                mint=position.mint,
-                symbol=position.symbol,
-                name=position.symbol,
-                price_usd=position.current_price
-            )
+            token = token_cache.get(position.mint)
+            if token is None:
+                token = TokenInfo(
+                    mint=position.mint,
+                    symbol=position.symbol,
+                    name=position.symbol,
+                    price_usd=position.current_price
+                )
             
             signal = TradeSignal(
                 token=token,
@@ -175,7 +245,7 @@ class SellAgent:
                 confidence=1.0,
                 suggested_amount_sol=position.amount_sol_invested,
                 risk_level="emergency",
-                reasons=["Emergency exit triggered"],
+                reasons=list(_EMERGENCY_REASONS),
                 source_agent="sell_agent",
                 strategy="emergency"
             )
@@ -206,30 +276,18 @@ class SellAgent:
         """
         Get statistics on exit signals
         """
-        if not self.exit_signals:
+        counts = self._exit_counts
+        if not counts["total"]:
             return {"total": 0}
         
-        stop_losses = sum(1 for s in self.exit_signals if "stop loss" in str(s.reasons).lower())
-        take_profits = sum(1 for s in self.exit_signals if "take profit" in str(s.reasons).lower())
-        timeouts = sum(1 for s in self.exit_signals if "timeout" in str(s.reasons).lower())
-        emergencies = sum(1 for s in self.exit_signals if "emergency" in str(s.reasons).lower())
-        
         return {
-            "total": len(self.exit_signals),
-            "stop_losses": stop_losses,
-            "take_profits": take_profits,
-            "timeouts": timeouts,
-            "emergencies": emergencies
+            "total": counts["total"],
+            **{key: counts[key] for key, _ in EXIT_CATEGORIES}
         }
 
 
 # Singleton instance
-_sell_agent: Optional[SellAgent] = None
-
-
+@lru_cache(maxsize=None)
 def get_sell_agent() -> SellAgent:
     """Get or create the sell agent singleton"""
-    global _sell_agent
-    if _sell_agent is None:
-        _sell_agent = SellAgent()
-    return _sell_agent
+    return SellAgent()
@@ -7,15 +7,65 @@ import asyncio
 import aiohttp
 import logging
 import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import asdict
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
-from collections import Counter
+from typing import Deque, List, Optional, Dict, Any, Tuple
+
+import numpy as np
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; fall back to a regex alternation
+    ahocorasick = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy comparisons
+    njit = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; results are then cached in-process only
+    aioredis = None
 
 from src.types import TokenInfo, SentimentResult
-from src.constants import TradingThresholds
+from src.services.http_session import get_shared_session
+from src.constants import TradingThresholds, REDIS_URL
 
 logger = logging.getLogger(__name__)
 
+# Overall score weights per source: Twitter, Telegram, Reddit
+_SOURCE_WEIGHTS = np.array([0.6, 0.25, 0.15])
+
+
+def _tally_tweets(pos_matches, neg_matches):
+    """
+    (positive, negative) tweet counts from per-tweet keyword hit counts,
+    in one branchless pass. Compiled with numba when it is installed.
+    """
+    positive = 0
+    negative = 0
+    for i in range(pos_matches.shape[0]):
+        positive += pos_matches[i] > neg_matches[i]
+        negative += neg_matches[i] > pos_matches[i]
+    return positive, negative
+
+
+# Serial on purpose: per-symbol batches are at most ~100 tweets, too small
+# for thread fan-out to pay off
+_tally_tweets_jit = njit(cache=True)(_tally_tweets) if njit is not None else None
+
+
+def _decode_sentiment(raw: bytes) -> SentimentResult:
+    """Rebuild a SentimentResult from its L2 JSON field dict"""
+    fields = orjson.loads(raw)
+    fields["analyzed_at"] = datetime.fromisoformat(fields["analyzed_at"])
+    return SentimentResult(**fields)
+
 
 class SentimentAgent:
     """
@@ -46,11 +96,62 @@ class SentimentAgent:
         "don't buy", "warning", "suspicious", "sketchy", "bot"
     ]
     
+    # Twitter v2 recent search: query length limit and symbols per batched query
+    TWITTER_QUERY_MAX_CHARS = 512
+    TWITTER_BATCH_MAX_SYMBOLS = 15
+    # Tweets kept per symbol, the same as one unbatched search page
+    TWITTER_TWEETS_PER_SYMBOL = 100
+    
+    # Initial row count of the score/mention arrays (doubled when full)
+    METRICS_INITIAL_CAPACITY = 1024
+    
+    # Result cache: L1 in-process (TTL + LRU), L2 in Redis when REDIS_URL is set
+    SENTIMENT_TTL_SECS = 300
+    SENTIMENT_CACHE_MAX_SIZE = 10_000
+    SENTIMENT_L2_TTL_SECS = 3600
+    SENTIMENT_L2_KEY_PREFIX = "sentiment:"
+    SENTIMENT_INVALIDATION_CHANNEL = "chan:sentiment"
+    
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.sentiment_cache: Dict[str, SentimentResult] = {}
+        self.sentiment_cache: "OrderedDict[str, Tuple[float, SentimentResult]]" = OrderedDict()
         self._running = False
         
+        # L2 cache; invalidations from this instance are ignored by its own listener
+        self._redis = None
+        self._invalidation_task: Optional[asyncio.Task] = None
+        self._instance_id = uuid.uuid4().hex
+        
+        # Struct-of-arrays copy of the L1-cached scores for vectorized filters;
+        # a mint has a row exactly while it has an L1 entry, and rows freed on
+        # eviction are reused
+        self._mint_idx: Dict[str, int] = {}
+        self._mints: List[Optional[str]] = []
+        self._free_rows: Deque[int] = deque()
+        self._scores = np.zeros(self.METRICS_INITIAL_CAPACITY, dtype=np.float64)
+        self._mentions = np.zeros(self.METRICS_INITIAL_CAPACITY, dtype=np.int64)
+        self._updated_at = np.zeros(self.METRICS_INITIAL_CAPACITY, dtype=np.float64)
+        
+        # Simulated Twitter data (paper trading)
+        self._rng = np.random.default_rng()
+        self._positive_keyword_arr = np.array(self.POSITIVE_KEYWORDS, dtype=object)
+        
+        # Lower-cased keywords (positive first) and a single-pass matcher over them
+        self._keywords = tuple(kw.lower() for kw in self.POSITIVE_KEYWORDS + self.NEGATIVE_KEYWORDS)
+        self._num_positive = len(self.POSITIVE_KEYWORDS)
+        # First characters of the keywords, in both ASCII cases (raw-text prefilter)
+        first_chars = {kw[0] for kw in self._keywords if kw}
+        self._keyword_anchors = frozenset(first_chars | {c.upper() for c in first_chars if c.isascii()})
+        self._automaton = self._build_keyword_automaton()
+        if self._automaton is None:
+            self._keyword_regex = self._build_keyword_regex()
+            self._keyword_index = {kw: i for i, kw in enumerate(self._keywords)}
+            # Keywords contained in each keyword (a match implies all of them)
+            self._keyword_implied: Tuple[Tuple[int, ...], ...] = tuple(
+                tuple(j for j, other in enumerate(self._keywords) if other in kw)
+                for kw in self._keywords
+            )
+        
         # API keys (loaded from env)
         import os
         self.twitter_bearer = os.getenv("TWITTER_BEARER_TOKEN", "")
@@ -58,17 +159,28 @@ class SentimentAgent:
     
     async def start(self):
         """Initialize the sentiment agent"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        self.session = await get_shared_session()
+        
+        if REDIS_URL and aioredis is not None:
+            self._redis = aioredis.from_url(REDIS_URL)
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
+        
         self._running = True
         logger.info("📊 Sentiment Agent initialized")
     
     async def stop(self):
         """Shutdown the sentiment agent"""
         self._running = False
-        if self.session:
-            await self.session.close()
+        # The shared session outlives the agent; it is closed at app shutdown
+        self.session = None
+        
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+        
         logger.info("Sentiment Agent stopped")
     
     # =========================================================================
@@ -79,61 +191,79 @@ class SentimentAgent:
         """
         Perform comprehensive sentiment analysis for a token
         """
-        result = SentimentResult(
-            mint=token.mint,
-            symbol=token.symbol
-        )
-        
-        # Gather sentiment from multiple sources concurrently
-        tasks = []
-        
-        if self.twitter_bearer:
-            tasks.append(self._analyze_twitter(token.symbol))
-        else:
-            tasks.append(self._simulate_twitter(token.symbol))
-        
-        # Could add more sources here:
-        # tasks.append(self._analyze_telegram(token.symbol))
-        # tasks.append(self._analyze_reddit(token.symbol))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Aggregate results
-        twitter_result = results[0] if not isinstance(results[0], Exception) else {}
-        
-        result.twitter_score = twitter_result.get("score", 0)
-        result.twitter_mentions = twitter_result.get("mentions", 0)
-        result.top_keywords = twitter_result.get("keywords", [])
-        result.positive_mentions = twitter_result.get("positive", 0)
-        result.negative_mentions = twitter_result.get("negative", 0)
-        result.total_mentions = result.twitter_mentions
-        
-        # Calculate overall score (-10 to +10)
-        result.overall_score = self._calculate_overall_score(result)
-        
-        # Determine if trending
-        result.is_trending = result.total_mentions > 50 and result.overall_score > 2
-        
-        # Cache result
-        self.sentiment_cache[token.mint] = result
-        
-        sentiment_emoji = "🟢" if result.overall_score > 2 else "🔴" if result.overall_score < -2 else "🟡"
-        logger.info(
-            f"{sentiment_emoji} Sentiment for ${token.symbol}: "
-            f"{result.overall_score:.1f} ({result.total_mentions} mentions)"
-        )
+        return (await self.analyze_multiple([token]))[token.mint]
+    
+    def _record_results(
+        self,
+        tokens: List[TokenInfo],
+        twitter_results: List[Dict[str, Any]]
+    ) -> List[SentimentResult]:
+        """
+        Build, score and cache tokens' results from their per-source data
+        """
+        results = []
+        for token, twitter_result in zip(tokens, twitter_results):
+            result = SentimentResult(
+                mint=token.mint,
+                symbol=token.symbol
+            )
+            
+            result.twitter_score = twitter_result.get("score", 0)
+            result.twitter_mentions = twitter_result.get("mentions", 0)
+            result.top_keywords = twitter_result.get("keywords", [])
+            result.positive_mentions = twitter_result.get("positive", 0)
+            result.negative_mentions = twitter_result.get("negative", 0)
+            result.total_mentions = result.twitter_mentions
+            results.append(result)
+        
+        # Calculate overall scores (-10 to +10) for the whole batch
+        overall_scores = self._calculate_overall_scores(results)
+        
+        for result, overall_score in zip(results, overall_scores):
+            result.overall_score = overall_score
+            
+            # Determine if trending
+            result.is_trending = result.total_mentions > 50 and result.overall_score > 2
+            
+            # Cache result
+            self._cache_sentiment(result)
+            
+            sentiment_emoji = "🟢" if result.overall_score > 2 else "🔴" if result.overall_score < -2 else "🟡"
+            logger.info(
+                f"{sentiment_emoji} Sentiment for ${result.symbol}: "
+                f"{result.overall_score:.1f} ({result.total_mentions} mentions)"
+            )
         
-        return result
+        return results
     
     async def analyze_multiple(self, tokens: List[TokenInfo]) -> Dict[str, SentimentResult]:
         """
         Analyze sentiment for multiple tokens concurrently
+        
+        With live Twitter access, symbols are grouped into as few search
+        calls as the query length limit allows.
         """
-        tasks = [self.analyze_token(token) for token in tokens]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        analyzed = await self._lookup_cached([token.mint for token in tokens])
+        pending = [token for token in tokens if token.mint not in analyzed]
         
-        analyzed = {}
-        for token, result in zip(tokens, results):
+        # Could add more sources here (Telegram, Reddit), batched the same way
+        if self.twitter_bearer:
+            batches = self._twitter_query_batches(pending)
+            tasks = [self._analyze_twitter_batch(batch) for batch in batches]
+            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            pairs = []
+            for batch, results in zip(batches, batch_results):
+                if isinstance(results, Exception):
+                    results = [results] * len(batch)
+                pairs.extend(zip(batch, results))
+        else:
+            # Simulated data for the whole batch comes from one set of RNG draws
+            results = self._record_results(pending, self._simulate_batch(len(pending)))
+            await self._l2_store(results)
+            pairs = zip(pending, results)
+        
+        for token, result in pairs:
             if isinstance(result, SentimentResult):
                 analyzed[token.mint] = result
             else:
@@ -145,63 +275,329 @@ class SentimentAgent:
         """
         Check if a token passes the minimum sentiment threshold
         """
-        result = self.sentiment_cache.get(mint)
-        if not result:
+        i = self._mint_idx.get(mint)
+        if i is None:
             return False
         
-        return result.overall_score >= TradingThresholds.MIN_SENTIMENT_SCORE
+        if time.monotonic() - self._updated_at[i] >= self.SENTIMENT_TTL_SECS:
+            return False  # Stale
+        
+        return bool(self._scores[i] >= TradingThresholds.MIN_SENTIMENT_SCORE)
+    
+    def _store_metrics(self, result: SentimentResult):
+        """Write a result's score and mention count into the metric arrays"""
+        i = self._mint_idx.get(result.mint)
+        if i is None:
+            if self._free_rows:
+                i = self._free_rows.popleft()
+                self._mints[i] = result.mint
+            else:
+                i = len(self._mints)
+                if i == len(self._scores):
+                    self._scores = np.resize(self._scores, 2 * i)
+                    self._mentions = np.resize(self._mentions, 2 * i)
+                    self._updated_at = np.resize(self._updated_at, 2 * i)
+                self._mints.append(result.mint)
+            self._mint_idx[result.mint] = i
+        
+        self._scores[i] = result.overall_score
+        self._mentions[i] = result.total_mentions
+        self._updated_at[i] = time.monotonic()
+    
+    def _free_metrics(self, mint: str):
+        """Release a mint's metric row for reuse (no-op if it has none)"""
+        i = self._mint_idx.pop(mint, None)
+        if i is None:
+            return
+        
+        # Zeroed rows never match the trending mask
+        self._mints[i] = None
+        self._scores[i] = 0.0
+        self._mentions[i] = 0
+        self._updated_at[i] = -np.inf
+        self._free_rows.append(i)
+    
+    # =========================================================================
+    # RESULT CACHE
+    # =========================================================================
+    
+    def _get_cached_sentiment(self, mint: str) -> Optional[SentimentResult]:
+        """Return an L1-cached result if it is still fresh"""
+        entry = self.sentiment_cache.get(mint)
+        if entry is None:
+            return None
+        
+        cached_at, result = entry
+        if time.monotonic() - cached_at >= self.SENTIMENT_TTL_SECS:
+            del self.sentiment_cache[mint]
+            self._free_metrics(mint)
+            return None
+        
+        self.sentiment_cache.move_to_end(mint)
+        return result
+    
+    def _cache_sentiment(self, result: SentimentResult):
+        """Store a result in L1, evicting the least recently used entry"""
+        self.sentiment_cache[result.mint] = (time.monotonic(), result)
+        self.sentiment_cache.move_to_end(result.mint)
+        if len(self.sentiment_cache) > self.SENTIMENT_CACHE_MAX_SIZE:
+            evicted, _ = self.sentiment_cache.popitem(last=False)
+            self._free_metrics(evicted)
+        self._store_metrics(result)
+    
+    async def _lookup_cached(self, mints: List[str]) -> Dict[str, SentimentResult]:
+        """Fresh cached results for `mints`: L1 first, then one L2 read for the rest"""
+        found = {}
+        misses = []
+        for mint in mints:
+            result = self._get_cached_sentiment(mint)
+            if result is None:
+                misses.append(mint)
+            else:
+                found[mint] = result
+        
+        if not misses or self._redis is None:
+            return found
+        
+        try:
+            raws = await self._redis.mget([self.SENTIMENT_L2_KEY_PREFIX + mint for mint in misses])
+        except Exception as e:
+            logger.warning(f"Sentiment L2 read failed: {e}")
+            return found
+        
+        for mint, raw in zip(misses, raws):
+            if raw:
+                result = found[mint] = _decode_sentiment(raw)
+                self._cache_sentiment(result)
+        
+        return found
+    
+    async def _l2_store(self, results: List[SentimentResult]):
+        """Write results to L2 and tell sibling workers to drop their L1 copies"""
+        if self._redis is None or not results:
+            return
+        
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for result in results:
+                    pipe.set(
+                        self.SENTIMENT_L2_KEY_PREFIX + result.mint,
+                        orjson.dumps(asdict(result)),
+                        ex=self.SENTIMENT_L2_TTL_SECS
+                    )
+                    pipe.publish(
+                        self.SENTIMENT_INVALIDATION_CHANNEL,
+                        f"{self._instance_id}:{result.mint}"
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Sentiment L2 write failed: {e}")
+    
+    async def _listen_for_invalidations(self):
+        """Drop L1 entries that another worker has re-analyzed"""
+        try:
+            pubsub = self._redis.pubsub()
+            await pubsub.subscribe(self.SENTIMENT_INVALIDATION_CHANNEL)
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    
+                    sender, _, mint = message["data"].decode().partition(":")
+                    if sender == self._instance_id:
+                        continue
+                    
+                    self.sentiment_cache.pop(mint, None)
+                    self._free_metrics(mint)
+            finally:
+                await pubsub.reset()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Sentiment invalidation listener stopped: {e}")
     
     # =========================================================================
     # TWITTER/X ANALYSIS
     # =========================================================================
     
-    async def _analyze_twitter(self, symbol: str) -> Dict[str, Any]:
+    async def _analyze_twitter_batch(self, tokens: List[TokenInfo]) -> List[SentimentResult]:
+        """
+        Analyze a group of tokens from one Twitter search
         """
-        Analyze Twitter sentiment using API
+        tweets_by_symbol = await self._search_twitter([token.symbol for token in tokens])
+        
+        if tweets_by_symbol is None:
+            twitter_results = self._simulate_batch(len(tokens))
+        else:
+            twitter_results = [
+                self._process_tweets(tweets_by_symbol.get(token.symbol.lower(), []))
+                for token in tokens
+            ]
+        results = self._record_results(tokens, twitter_results)
+        
+        await self._l2_store(results)
+        return results
+    
+    async def _search_twitter(self, symbols: List[str]) -> Optional[Dict[str, List[Dict]]]:
         """
+        Search Twitter v2 recent tweets for `symbols` with one OR'd query and
+        split them by the $cashtag/#hashtag they mention (keys are lower-cased
+        symbols).
+        
+        Pages are followed until every symbol has TWITTER_TWEETS_PER_SYMBOL
+        tweets (what a search per symbol returns) or the results run out.
+        Symbols that fill up are dropped from the query, which resumes below
+        the oldest tweet seen, so one busy symbol cannot starve the rest.
+        
+        Returns None if the first API call fails.
+        """
+        # Lower-cased symbol -> symbol as given, in first-seen order
+        originals = {}
+        for symbol in symbols:
+            originals.setdefault(symbol.lower(), symbol)
+        
+        budget = self.TWITTER_TWEETS_PER_SYMBOL
+        tweets_by_symbol: Dict[str, List[Dict]] = {symbol: [] for symbol in originals}
+        remaining = list(originals)
+        
+        # Longest first so e.g. $BONK2 is not tagged as $BONK
+        tag_pattern = None
+        if len(remaining) > 1:
+            alternation = "|".join(
+                re.escape(symbol) for symbol in sorted(remaining, key=len, reverse=True)
+            )
+            tag_pattern = re.compile(rf"[$#]({alternation})(?!\w)")
+        
+        query_params = {"query": self._twitter_query(list(originals.values()))}
+        params = query_params
+        oldest_id: Optional[int] = None
+        pages = 0
+        
+        while True:
+            data = await self._fetch_twitter_page(params)
+            if data is None:
+                if not pages:
+                    return None
+                break  # Keep the pages already collected
+            pages += 1
+            
+            tweets = data.get("data", [])
+            for tweet in tweets:
+                if tag_pattern is None:
+                    tags = remaining
+                else:
+                    tags = set(tag_pattern.findall(tweet.get("text", "").lower()))
+                for symbol in tags:
+                    bucket = tweets_by_symbol[symbol]
+                    if len(bucket) < budget:
+                        bucket.append(tweet)
+                
+                tweet_id = int(tweet["id"])
+                if oldest_id is None or tweet_id < oldest_id:
+                    oldest_id = tweet_id
+            
+            next_token = data.get("meta", {}).get("next_token")
+            unfilled = [symbol for symbol in remaining if len(tweets_by_symbol[symbol]) < budget]
+            if not unfilled or not next_token:
+                break
+            
+            if len(unfilled) < len(remaining) and oldest_id is not None:
+                # Everything newer than oldest_id has been seen for the rest
+                remaining = unfilled
+                query_params = {
+                    "query": self._twitter_query([originals[symbol] for symbol in remaining]),
+                    "until_id": str(oldest_id)
+                }
+                params = query_params
+            else:
+                params = {**query_params, "next_token": next_token}
+        
+        return tweets_by_symbol
+    
+    async def _fetch_twitter_page(self, params: Dict[str, str]) -> Optional[Dict]:
+        """One Twitter v2 recent search page, or None if the call fails"""
         try:
             # Twitter API v2 search
             url = "https://api.twitter.com/2/tweets/search/recent"
             headers = {"Authorization": f"Bearer {self.twitter_bearer}"}
             params = {
-                "query": f"${symbol} OR #{symbol} -is:retweet lang:en",
+                **params,
                 "max_results": 100,
                 "tweet.fields": "created_at,public_metrics"
             }
             
             async with self.session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    tweets = data.get("data", [])
-                    return self._process_tweets(tweets)
-                else:
+                if response.status != 200:
                     logger.warning(f"Twitter API returned {response.status}")
-                    return self._simulate_twitter(symbol)
+                    return None
+                
+                return await response.json()
         
         except Exception as e:
             logger.error(f"Twitter analysis error: {e}")
-            return await self._simulate_twitter(symbol)
+            return None
     
-    async def _simulate_twitter(self, symbol: str) -> Dict[str, Any]:
+    def _twitter_query(self, symbols: List[str]) -> str:
+        """Search query matching any of `symbols` as a cashtag or hashtag"""
+        terms = " OR ".join(f"${symbol} OR #{symbol}" for symbol in symbols)
+        if len(symbols) > 1:
+            terms = f"({terms})"
+        return f"{terms} -is:retweet lang:en"
+    
+    def _twitter_query_batches(self, tokens: List[TokenInfo]) -> List[List[TokenInfo]]:
+        """Group tokens so each group's search query fits the length limit"""
+        batches: List[List[TokenInfo]] = []
+        batch: List[TokenInfo] = []
+        
+        for token in tokens:
+            candidate = batch + [token]
+            symbols = [t.symbol for t in candidate]
+            if batch and (
+                len(candidate) > self.TWITTER_BATCH_MAX_SYMBOLS
+                or len(self._twitter_query(symbols)) > self.TWITTER_QUERY_MAX_CHARS
+            ):
+                batches.append(batch)
+                candidate = [token]
+            batch = candidate
+        
+        if batch:
+            batches.append(batch)
+        
+        return batches
+    
+    def _simulate_batch(self, n: int) -> List[Dict[str, Any]]:
         """
-        Simulate Twitter sentiment for paper trading/testing
+        Simulated Twitter results for `n` tokens, drawn as whole arrays
         """
-        import random
-        
-        # Generate realistic-looking fake data
-        mentions = random.randint(10, 200)
-        positive = int(mentions * random.uniform(0.3, 0.7))
-        negative = int(mentions * random.uniform(0.1, 0.3))
+        if n == 0:
+            return []
         
-        score = (positive - negative) / max(mentions, 1) * 10
+        rng = self._rng
         
-        return {
-            "score": round(score, 2),
-            "mentions": mentions,
-            "positive": positive,
-            "negative": negative,
-            "keywords": random.sample(self.POSITIVE_KEYWORDS, min(3, len(self.POSITIVE_KEYWORDS)))
-        }
+        # Generate realistic-looking fake data
+        mentions = rng.integers(10, 201, n)
+        positive = (mentions * rng.uniform(0.3, 0.7, n)).astype(np.int64)
+        negative = (mentions * rng.uniform(0.1, 0.3, n)).astype(np.int64)
+        
+        score = np.round((positive - negative) / np.maximum(mentions, 1) * 10, 2)
+        
+        # Sample keywords without replacement per row (random-key argsort)
+        k = min(3, len(self._positive_keyword_arr))
+        picks = np.argsort(rng.random((n, len(self._positive_keyword_arr))), axis=1)[:, :k]
+        keywords = self._positive_keyword_arr[picks].tolist()
+        
+        return [
+            {
+                "score": s,
+                "mentions": m,
+                "positive": p,
+                "negative": q,
+                "keywords": kw
+            }
+            for s, m, p, q, kw in zip(
+                score.tolist(), mentions.tolist(), positive.tolist(), negative.tolist(), keywords
+            )
+        ]
     
     def _process_tweets(self, tweets: List[Dict]) -> Dict[str, Any]:
         """
@@ -210,33 +606,52 @@ class SentimentAgent:
         if not tweets:
             return {"score": 0, "mentions": 0, "positive": 0, "negative": 0, "keywords": []}
         
-        positive = 0
-        negative = 0
-        all_keywords = []
-        
-        for tweet in tweets:
-            text = tweet.get("text", "").lower()
-            
-            # Score based on keywords
-            pos_matches = sum(1 for kw in self.POSITIVE_KEYWORDS if kw.lower() in text)
-            neg_matches = sum(1 for kw in self.NEGATIVE_KEYWORDS if kw.lower() in text)
-            
-            if pos_matches > neg_matches:
-                positive += 1
-            elif neg_matches > pos_matches:
-                negative += 1
-            
-            # Extract keywords
-            for kw in self.POSITIVE_KEYWORDS + self.NEGATIVE_KEYWORDS:
-                if kw.lower() in text:
-                    all_keywords.append(kw)
-        
-        # Get top keywords
-        keyword_counts = Counter(all_keywords)
-        top_keywords = [kw for kw, _ in keyword_counts.most_common(5)]
+        total = len(tweets)
+        num_keywords = len(self._keywords)
+        
+        # Blank out ASCII tweets without any keyword's first character (cheap
+        # C-level set check) so the matcher skips them
+        anchors = self._keyword_anchors
+        texts = [
+            "" if text.isascii() and anchors.isdisjoint(text) else text
+            for text in (tweet.get("text", "") for tweet in tweets)
+        ]
+        
+        # Scan all tweets in one pass over a single lower-cased buffer; "\x00" is
+        # in no keyword, so hits never span tweets and each offset maps back to
+        # its tweet via the start offsets
+        blob = "\x00".join(texts).lower()
+        starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]])
+        if len(blob) != starts[-1] + len(texts[-1]):
+            # Lower-casing lengthened some non-ASCII text; use the separators
+            starts = np.array([0] + [m.end() for m in re.finditer("\x00", blob)])
+        offsets, hit_keywords = self._scan_keywords(blob)
+        hit_tweets = np.searchsorted(starts, offsets, side="right") - 1
+        
+        # Each keyword counts once per tweet; unique pairs come out sorted by tweet
+        pairs = np.unique(hit_tweets * num_keywords + hit_keywords)
+        hit_tweets, hit_keywords = np.divmod(pairs, num_keywords)
+        
+        # Score based on keywords
+        is_positive = hit_keywords < self._num_positive
+        pos_matches = np.bincount(hit_tweets[is_positive], minlength=total)
+        neg_matches = np.bincount(hit_tweets[~is_positive], minlength=total)
+        if _tally_tweets_jit is not None:
+            positive, negative = _tally_tweets_jit(pos_matches, neg_matches)
+        else:
+            positive = int((pos_matches > neg_matches).sum())
+            negative = int((neg_matches > pos_matches).sum())
+        
+        # Get top keywords (most mentioned, ties by first appearance)
+        counts = np.bincount(hit_keywords, minlength=num_keywords)
+        first_seen = np.full(num_keywords, len(hit_keywords))
+        seen, first_index = np.unique(hit_keywords, return_index=True)
+        first_seen[seen] = first_index
+        top_keywords = [
+            self._keywords[i] for i in np.lexsort((first_seen, -counts))[:5] if counts[i]
+        ]
         
         # Calculate score
-        total = len(tweets)
         score = ((positive - negative) / total) * 10 if total > 0 else 0
         
         return {
@@ -247,40 +662,74 @@ class SentimentAgent:
             "keywords": top_keywords
         }
     
+    def _build_keyword_automaton(self):
+        """Aho-Corasick automaton over self._keywords (None if unavailable)"""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for i, kw in enumerate(self._keywords):
+            automaton.add_word(kw, i)
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_keyword_regex(self) -> re.Pattern:
+        """
+        Fallback matcher: one alternation of all keywords, longest first.
+        
+        The zero-width lookahead finds a match at every position, so
+        overlapping keywords are all reported.
+        """
+        alternation = "|".join(
+            re.escape(kw) for kw in sorted(set(self._keywords), key=len, reverse=True)
+        )
+        return re.compile(f"(?=({alternation}))")
+    
+    def _scan_keywords(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(offsets, indices into self._keywords) of every hit in lower-cased `text`"""
+        if self._automaton is not None:
+            hits = list(self._automaton.iter(text))
+        else:
+            hits = [
+                (match.start(), i)
+                for match in self._keyword_regex.finditer(text)
+                for i in self._keyword_implied[self._keyword_index[match.group(1)]]
+            ]
+        
+        if not hits:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        
+        offsets, keyword_ids = np.array(hits, dtype=np.int64).T
+        return offsets, keyword_ids
+    
     # =========================================================================
     # SCORING
     # =========================================================================
     
-    def _calculate_overall_score(self, result: SentimentResult) -> float:
+    def _calculate_overall_scores(self, results: List[SentimentResult]) -> List[float]:
         """
-        Calculate overall sentiment score from all sources
+        Calculate overall sentiment scores from all sources, one row per result
         """
-        scores = []
-        weights = []
-        
-        # Twitter (highest weight)
-        if result.twitter_mentions > 0:
-            scores.append(result.twitter_score)
-            weights.append(0.6)
-        
-        # Telegram
-        if result.telegram_score != 0:
-            scores.append(result.telegram_score)
-            weights.append(0.25)
-        
-        # Reddit
-        if result.reddit_score != 0:
-            scores.append(result.reddit_score)
-            weights.append(0.15)
-        
-        if not scores:
-            return 0.0
-        
-        # Weighted average
-        total_weight = sum(weights[:len(scores)])
-        weighted_sum = sum(s * w for s, w in zip(scores, weights[:len(scores)]))
+        scores = np.array(
+            [(r.twitter_score, r.telegram_score, r.reddit_score) for r in results],
+            dtype=float
+        ).reshape(len(results), 3)
+        
+        # Twitter counts whenever it has mentions; other sources when non-zero
+        mask = scores != 0
+        mask[:, 0] = [r.twitter_mentions > 0 for r in results]
+        
+        # Masked weighted average (masked-out terms add exact zeros)
+        weights = mask * _SOURCE_WEIGHTS
+        total_weight = weights.sum(axis=1)
+        weighted_sum = (scores * weights).sum(axis=1)
+        overall = np.divide(
+            weighted_sum, total_weight,
+            out=np.zeros(len(results)), where=total_weight > 0
+        )
         
-        return round(weighted_sum / total_weight, 2) if total_weight > 0 else 0.0
+        return [round(score, 2) for score in overall.tolist()]
     
     # =========================================================================
     # TREND DETECTION
@@ -292,11 +741,10 @@ class SentimentAgent:
         """
         await self.analyze_multiple(tokens)
         
-        trending = []
-        for token in tokens:
-            result = self.sentiment_cache.get(token.mint)
-            if result and result.is_trending:
-                trending.append(token)
+        n = len(self._mints)
+        hot = np.flatnonzero((self._mentions[:n] > 50) & (self._scores[:n] > 2))
+        trending_mints = {self._mints[i] for i in hot}
+        trending = [token for token in tokens if token.mint in trending_mints]
         
         logger.info(f"🔥 Found {len(trending)} trending tokens")
         return trending
@@ -4,16 +4,30 @@ Executes trades with Jito bundle support for MEV protection.
 """
 
 import asyncio
+import aiohttp
+import base64
 import logging
-import uuid
+import orjson
+import secrets
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
+from itertools import count, islice
+from typing import Deque, Optional, Dict, Any, List, Tuple
 import os
 import json
 
+import numpy as np
+
+try:
+    import pybase64
+except ImportError:  # pybase64 is optional; fall back to the stdlib decoder
+    pybase64 = None
+
 from src.types import (
     TradeSignal, Trade, TradeAction, TradeStatus, Position
 )
+from src.services.http_session import get_shared_session
 from src.constants import (
     SOLANA_RPC, JUPITER_API, JUPITER_QUOTE_URL, JUPITER_SWAP_URL,
     JITO_BLOCK_ENGINE, JITO_TIP_ACCOUNT, JITO_TIP_LAMPORTS,
@@ -26,6 +40,9 @@ logger = logging.getLogger(__name__)
 SOL_MINT = "So11111111111111111111111111111111111111112"
 WSOL_MINT = SOL_MINT
 
+# Jupiter calls get a longer budget than the shared session default
+JUPITER_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
 
 class SniperAgent:
     """
@@ -39,34 +56,68 @@ class SniperAgent:
     - Paper trading simulation
     """
     
+    # Bounded trade bookkeeping
+    TRADE_HISTORY_MAX = 10_000
+    MAX_PENDING_TRADES = 64
+    
+    # Prefetched Jupiter quotes older than this are discarded
+    QUOTE_PREFETCH_MAX_AGE_SECS = 10.0
+    
+    # Trade ids: per-process random nonce + counter (no urandom read per trade)
+    _trade_nonce = secrets.token_hex(2)
+    _trade_counter = count()
+    
+    # Paper position table starts with this many rows and doubles when full
+    PAPER_POSITIONS_INITIAL_CAPACITY = 256
+    
     def __init__(self):
-        self.session = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._rpc = None  # solana AsyncClient, kept open for mainnet sends
         self._running = False
         
         # Trade tracking
         self.pending_trades: Dict[str, Trade] = {}
-        self.executed_trades: List[Trade] = []
+        self.executed_trades: Deque[Trade] = deque(maxlen=self.TRADE_HISTORY_MAX)
+        
+        # Ring-buffer columns mirroring executed_trades for vectorized P&L queries
+        self._trade_pnl_sol = np.zeros(self.TRADE_HISTORY_MAX)
+        self._trade_amount_sol = np.zeros(self.TRADE_HISTORY_MAX)
+        self._trade_count = 0  # All-time; ring slot is _trade_count % TRADE_HISTORY_MAX
         self.open_positions: Dict[str, Position] = {}
         
+        # Dashboard rows, rebuilt only after positions/trades change:
+        # (positions generation, rows) and ((trade count, limit), rows)
+        self._positions_gen = 0
+        self._position_rows: Tuple[int, List[Dict[str, Any]]] = (-1, [])
+        self._trade_rows: Tuple[Tuple[int, int], List[Dict[str, Any]]] = ((-1, 0), [])
+        
+        # signal_id -> (started_at monotonic, quote task)
+        self._quote_futures: Dict[str, Tuple[float, asyncio.Task]] = {}
+        
         # Wallet config
         self.wallet_keypair = None
         self.wallet_pubkey = None
         
         # Paper trading state
         self.paper_balance_sol = 1.0  # Start with 1 SOL for paper trading
-        self.paper_positions: Dict[str, Dict] = {}
+        
+        # Paper positions as struct-of-arrays rows: mint -> row, plus a free-row list
+        capacity = self.PAPER_POSITIONS_INITIAL_CAPACITY
+        self._pp_price = np.zeros(capacity)   # Entry price (USD)
+        self._pp_sol = np.zeros(capacity)     # SOL invested
+        self._pp_tok = np.zeros(capacity)     # Tokens held
+        self._pp_idx: Dict[str, int] = {}
+        self._pp_free: Deque[int] = deque(range(capacity))
     
     async def start(self):
         """Initialize the sniper agent"""
-        import aiohttp
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=60)
-        )
+        self.session = await get_shared_session()
         self._running = True
         
-        # Load wallet if mainnet
+        # Load wallet and open the RPC client if mainnet
         if MAINNET_ENABLED:
             await self._load_wallet()
+            self._get_rpc_client()
         
         mode = "🔴 MAINNET" if MAINNET_ENABLED else "📝 PAPER TRADING"
         logger.info(f"🎯 Sniper Agent initialized ({mode})")
@@ -74,8 +125,17 @@ class SniperAgent:
     async def stop(self):
         """Shutdown the sniper agent"""
         self._running = False
-        if self.session:
-            await self.session.close()
+        # The shared session outlives the agent; it is closed at app shutdown
+        self.session = None
+        
+        if self._rpc is not None:
+            await self._rpc.close()
+            self._rpc = None
+        
+        for _, task in self._quote_futures.values():
+            task.cancel()
+        self._quote_futures.clear()
+        
         logger.info("Sniper Agent stopped")
     
     async def _load_wallet(self):
@@ -107,7 +167,11 @@ class SniperAgent:
         """
         Execute a trade signal
         """
-        trade_id = str(uuid.uuid4())[:8]
+        if len(self.pending_trades) >= self.MAX_PENDING_TRADES:
+            logger.warning(f"Too many pending trades ({len(self.pending_trades)}); skipping ${signal.token.symbol}")
+            return None
+        
+        trade_id = f"{self._trade_nonce}{next(self._trade_counter):04x}"
         
         trade = Trade(
             trade_id=trade_id,
@@ -131,7 +195,7 @@ class SniperAgent:
             if result:
                 trade.status = TradeStatus.CONFIRMED
                 trade.executed_at = datetime.now(timezone.utc)
-                self.executed_trades.append(trade)
+                self._record_executed(trade)
                 
                 # Create position for buys
                 if signal.action == TradeAction.BUY:
@@ -176,31 +240,36 @@ class SniperAgent:
             trade.amount_tokens = tokens_received
             trade.fees_paid_sol = trade.amount_sol * 0.003  # 0.3% fees
             
-            self.paper_positions[trade.mint] = {
-                "tokens": tokens_received,
-                "entry_price": signal.token.price_usd,
-                "entry_sol": trade.amount_sol
-            }
+            row = self._pp_idx.get(trade.mint)
+            if row is None:
+                row = self._pp_alloc_row()
+                self._pp_idx[trade.mint] = row
+            self._pp_price[row] = signal.token.price_usd
+            self._pp_sol[row] = trade.amount_sol
+            self._pp_tok[row] = tokens_received
         
         elif signal.action == TradeAction.SELL:
             # Check position
-            if trade.mint not in self.paper_positions:
+            row = self._pp_idx.get(trade.mint)
+            if row is None:
                 logger.warning(f"No paper position for {trade.mint[:8]}...")
                 return False
             
-            pos = self.paper_positions[trade.mint]
+            entry_price = float(self._pp_price[row])
+            entry_sol = float(self._pp_sol[row])
             
             # Simulate sell
             exit_price = signal.token.price_usd
-            pnl_pct = (exit_price - pos["entry_price"]) / pos["entry_price"]
-            sol_received = pos["entry_sol"] * (1 + pnl_pct)
+            pnl_pct = (exit_price - entry_price) / entry_price
+            sol_received = entry_sol * (1 + pnl_pct)
             
             self.paper_balance_sol += sol_received
             trade.exit_price = exit_price
-            trade.pnl_sol = sol_received - pos["entry_sol"]
+            trade.pnl_sol = sol_received - entry_sol
             trade.pnl_pct = pnl_pct * 100
             
-            del self.paper_positions[trade.mint]
+            del self._pp_idx[trade.mint]
+            self._pp_free.append(row)
         
         # Simulate network delay
         await asyncio.sleep(0.5)
@@ -216,13 +285,15 @@ class SniperAgent:
             return False
         
         try:
-            # 1. Get Jupiter quote
-            quote = await self._get_jupiter_quote(
-                input_mint=SOL_MINT if signal.action == TradeAction.BUY else signal.token.mint,
-                output_mint=signal.token.mint if signal.action == TradeAction.BUY else SOL_MINT,
-                amount=int(trade.amount_sol * 1e9) if signal.action == TradeAction.BUY else int(trade.amount_tokens * 1e9),
-                slippage_bps=50  # 0.5%
-            )
+            # 1. Get Jupiter quote (prefetched when the signal was queued, if still fresh)
+            quote = await self._take_prefetched_quote(signal)
+            if not quote:
+                quote = await self._get_jupiter_quote(
+                    input_mint=SOL_MINT if signal.action == TradeAction.BUY else signal.token.mint,
+                    output_mint=signal.token.mint if signal.action == TradeAction.BUY else SOL_MINT,
+                    amount=int(trade.amount_sol * 1e9) if signal.action == TradeAction.BUY else int(trade.amount_tokens * 1e9),
+                    slippage_bps=50  # 0.5%
+                )
             
             if not quote:
                 return False
@@ -250,6 +321,49 @@ class SniperAgent:
     # JUPITER INTEGRATION
     # =========================================================================
     
+    def prefetch_quote(self, signal: TradeSignal):
+        """
+        Start fetching the Jupiter quote for a buy signal as soon as it is
+        queued, so execution skips one round trip (mainnet only)
+        """
+        if PAPER_TRADING or signal.action != TradeAction.BUY:
+            return
+        
+        self._prune_prefetched_quotes()
+        if signal.signal_id in self._quote_futures:
+            return
+        
+        task = asyncio.create_task(self._get_jupiter_quote(
+            input_mint=SOL_MINT,
+            output_mint=signal.token.mint,
+            amount=int(signal.suggested_amount_sol * 1e9),
+            slippage_bps=50  # 0.5%
+        ))
+        self._quote_futures[signal.signal_id] = (time.monotonic(), task)
+    
+    async def _take_prefetched_quote(self, signal: TradeSignal) -> Optional[Dict[str, Any]]:
+        """Await the prefetched quote for a signal, if there is a fresh one"""
+        entry = self._quote_futures.pop(signal.signal_id, None)
+        if entry is None:
+            return None
+        
+        started_at, task = entry
+        if time.monotonic() - started_at > self.QUOTE_PREFETCH_MAX_AGE_SECS:
+            task.cancel()
+            return None
+        
+        return await task
+    
+    def _prune_prefetched_quotes(self):
+        """Cancel and drop prefetched quotes that are too old to use"""
+        now = time.monotonic()
+        stale = [
+            signal_id for signal_id, (started_at, _) in self._quote_futures.items()
+            if now - started_at > self.QUOTE_PREFETCH_MAX_AGE_SECS
+        ]
+        for signal_id in stale:
+            self._quote_futures.pop(signal_id)[1].cancel()
+    
     async def _get_jupiter_quote(
         self,
         input_mint: str,
@@ -270,9 +384,11 @@ class SniperAgent:
                 "asLegacyTransaction": "false"
             }
             
-            async with self.session.get(JUPITER_QUOTE_URL, params=params) as response:
+            async with self.session.get(
+                JUPITER_QUOTE_URL, params=params, timeout=JUPITER_TIMEOUT
+            ) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 else:
                     logger.warning(f"Jupiter quote failed: {response.status}")
                     return None
@@ -297,9 +413,11 @@ class SniperAgent:
                 }
             }
             
-            async with self.session.post(JUPITER_SWAP_URL, json=payload) as response:
+            async with self.session.post(
+                JUPITER_SWAP_URL, json=payload, timeout=JUPITER_TIMEOUT
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     return data.get("swapTransaction")
                 else:
                     logger.warning(f"Jupiter swap failed: {response.status}")
@@ -314,26 +432,27 @@ class SniperAgent:
         Sign and send transaction (optionally via Jito)
         """
         try:
-            import base64
             from solders.transaction import VersionedTransaction
-            from solana.rpc.async_api import AsyncClient
+            from solana.rpc.types import TxOpts
             
-            # Decode transaction
-            tx_bytes = base64.b64decode(swap_tx)
+            # Decode transaction (SIMD base64 when pybase64 is installed)
+            if pybase64 is not None:
+                tx_bytes = pybase64.b64decode(swap_tx, validate=False)
+            else:
+                tx_bytes = base64.b64decode(swap_tx)
             tx = VersionedTransaction.from_bytes(tx_bytes)
             
             # Sign
             tx.sign([self.wallet_keypair])
             
             # Send
-            async with AsyncClient(SOLANA_RPC) as client:
-                result = await client.send_transaction(
-                    tx,
-                    opts={"skip_preflight": True, "max_retries": 3}
-                )
-                
-                if result.value:
-                    return str(result.value)
+            result = await self._get_rpc_client().send_transaction(
+                tx,
+                opts=TxOpts(skip_preflight=True, max_retries=3)
+            )
+            
+            if result.value:
+                return str(result.value)
             
             return None
         
@@ -341,6 +460,13 @@ class SniperAgent:
             logger.error(f"Sign/send error: {e}")
             return None
     
+    def _get_rpc_client(self):
+        """Get or create the agent's long-lived Solana RPC client"""
+        if self._rpc is None:
+            from solana.rpc.async_api import AsyncClient
+            self._rpc = AsyncClient(SOLANA_RPC, commitment="processed")
+        return self._rpc
+    
     # =========================================================================
     # POSITION MANAGEMENT
     # =========================================================================
@@ -364,6 +490,7 @@ class SniperAgent:
         )
         
         self.open_positions[trade.mint] = position
+        self._positions_gen += 1
     
     def get_position(self, mint: str) -> Optional[Position]:
         """Get open position for a token"""
@@ -403,9 +530,48 @@ class SniperAgent:
         
         if trade and trade.status == TradeStatus.CONFIRMED:
             del self.open_positions[mint]
+            self._positions_gen += 1
         
         return trade
     
+    def mark_positions_updated(self):
+        """Invalidate the dashboard rows after open positions were re-priced"""
+        self._positions_gen += 1
+    
+    def get_position_rows(self) -> List[Dict[str, Any]]:
+        """Open positions as dashboard rows (cached until positions change)"""
+        gen, rows = self._position_rows
+        if gen != self._positions_gen:
+            rows = [
+                {
+                    "symbol": p.symbol,
+                    "entry": p.entry_price,
+                    "current": p.current_price,
+                    "pnl_pct": p.unrealized_pnl_pct,
+                    "pnl_sol": p.unrealized_pnl_sol,
+                }
+                for p in self.open_positions.values()
+            ]
+            self._position_rows = (self._positions_gen, rows)
+        return rows
+    
+    def get_trade_rows(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recent trades as dashboard rows (cached until a trade is recorded)"""
+        key, rows = self._trade_rows
+        if key != (self._trade_count, limit):
+            rows = [
+                {
+                    "symbol": t.symbol,
+                    "action": t.action.value,
+                    "amount": t.amount_sol,
+                    "pnl": t.pnl_sol,
+                    "status": t.status.value,
+                }
+                for t in self.get_trade_history(limit)
+            ]
+            self._trade_rows = ((self._trade_count, limit), rows)
+        return rows
+    
     # =========================================================================
     # STATE
     # =========================================================================
@@ -414,9 +580,72 @@ class SniperAgent:
         """Get current paper trading balance"""
         return self.paper_balance_sol
     
+    @property
+    def paper_positions(self) -> Dict[str, Dict]:
+        """Snapshot of open paper positions keyed by mint"""
+        return {
+            mint: {
+                "tokens": float(self._pp_tok[row]),
+                "entry_price": float(self._pp_price[row]),
+                "entry_sol": float(self._pp_sol[row])
+            }
+            for mint, row in self._pp_idx.items()
+        }
+    
+    def mark_paper_positions(self, prices: Dict[str, float]) -> float:
+        """
+        Value all open paper positions in SOL at the given USD prices
+        (mints without a price are valued at entry)
+        """
+        if not self._pp_idx:
+            return 0.0
+        
+        rows = np.fromiter(self._pp_idx.values(), dtype=np.intp, count=len(self._pp_idx))
+        entry_price = self._pp_price[rows]
+        mark_price = np.fromiter(
+            (prices.get(mint, 0.0) for mint in self._pp_idx),
+            dtype=float, count=len(rows)
+        )
+        mark_price = np.where(mark_price > 0, mark_price, entry_price)
+        
+        return float((self._pp_sol[rows] * (mark_price / entry_price)).sum())
+    
     def get_trade_history(self, limit: int = 50) -> List[Trade]:
         """Get recent trade history"""
-        return self.executed_trades[-limit:]
+        trades = self.executed_trades
+        return list(islice(trades, max(0, len(trades) - limit), None))
+    
+    def get_trade_stats(self) -> Dict[str, float]:
+        """P&L summary over the retained trade history"""
+        n = min(self._trade_count, self.TRADE_HISTORY_MAX)
+        pnl = self._trade_pnl_sol[:n]
+        
+        return {
+            "trades": n,
+            "volume_sol": float(self._trade_amount_sol[:n].sum()),
+            "realized_pnl_sol": float(pnl.sum()),
+            "wins": int((pnl > 0).sum()),
+            "losses": int((pnl < 0).sum()),
+        }
+    
+    def _pp_alloc_row(self) -> int:
+        """Take a free paper position row, doubling the table when full"""
+        if not self._pp_free:
+            old = self._pp_price.size
+            self._pp_price = np.resize(self._pp_price, old * 2)
+            self._pp_sol = np.resize(self._pp_sol, old * 2)
+            self._pp_tok = np.resize(self._pp_tok, old * 2)
+            self._pp_free.extend(range(old, old * 2))
+        return self._pp_free.popleft()
+    
+    def _record_executed(self, trade: Trade):
+        """Append a confirmed trade to the history ring and its columns"""
+        self.executed_trades.append(trade)
+        
+        slot = self._trade_count % self.TRADE_HISTORY_MAX
+        self._trade_pnl_sol[slot] = trade.pnl_sol
+        self._trade_amount_sol[slot] = trade.amount_sol
+        self._trade_count += 1
 
 
 # Singleton instance
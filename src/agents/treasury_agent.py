@@ -4,21 +4,81 @@ Manages the 4-way fee split and bot trading capital.
 """
 
 import asyncio
+import heapq
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy argsort
+    njit = None
 
 from src.constants import TOKENOMICS, PAPER_TRADING
 from src.types import TreasurySnapshot
 
 logger = logging.getLogger(__name__)
 
+# One fee record row: collection time, fee and bucket shares (SOL), source trade
+_FEE_RECORD_DTYPE = np.dtype([
+    ("timestamp_ns", np.int64),
+    ("total", np.float64),
+    ("bot", np.float64),
+    ("infra", np.float64),
+    ("dev", np.float64),
+    ("builder", np.float64),
+    ("trade_id", object),
+])
+
+
+def _rank_by_roi(pnl, allocated, scale):
+    """
+    ROI per agent (P&L over allocated capital, times `scale`) and the agent
+    rows ranked by it, best first. Ties keep row order.
+    Compiled with numba when it is installed.
+    """
+    n = pnl.shape[0]
+    neg_roi = np.empty(n)
+    for i in range(n):
+        neg_roi[i] = -(pnl[i] / max(allocated[i], 0.001) * scale)
+    ranked = np.argsort(neg_roi, kind="mergesort")
+    return -neg_roi, ranked
+
+
+# fastmath is left off so rankings match the Python ROI expression exactly
+_rank_by_roi_jit = njit(cache=True)(_rank_by_roi) if njit is not None else None
+
+
+def _rebalance_bonuses(roi, rows, balance, min_allocation):
+    """
+    Bonus capital for each of `rows` (best first): 10% of the remaining
+    balance, capped at 0.02 SOL, for rows with ROI above 10%. Bonuses that
+    allocate_to_agent would reject are left at zero.
+    Compiled with numba when it is installed.
+    """
+    bonuses = np.zeros(rows.shape[0])
+    for j in range(rows.shape[0]):
+        if roi[rows[j]] > 0.1:
+            bonus = min(0.02, balance * 0.1)
+            if bonus > 0 and min_allocation <= bonus <= balance:
+                bonuses[j] = bonus
+                balance -= bonus
+    return bonuses
+
+
+# Serial on purpose: each bonus depends on the balance left by the previous one
+_rebalance_bonuses_jit = njit(cache=True)(_rebalance_bonuses) if njit is not None else None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class FeeDistribution:
     """Record of a fee distribution"""
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp_ns: int = field(default_factory=time.time_ns)
     total_fee_sol: float = 0.0
     
     # Distribution amounts
@@ -30,9 +90,14 @@ class FeeDistribution:
     # Transaction
     tx_signature: Optional[str] = None
     source_trade_id: Optional[str] = None
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Collection time as a UTC datetime"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentAllocation:
     """Capital allocation to a specific trading agent"""
     agent_id: str
@@ -41,8 +106,18 @@ class AgentAllocation:
     current_balance: float = 0.0
     pnl: float = 0.0
     trades_executed: int = 0
-    win_rate: float = 0.0
-    allocated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    wins: int = 0
+    allocated_at_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def win_rate(self) -> float:
+        """Fraction of executed trades that were wins"""
+        return self.wins / self.trades_executed if self.trades_executed else 0.0
+    
+    @property
+    def allocated_at(self) -> datetime:
+        """Allocation time as a UTC datetime"""
+        return datetime.fromtimestamp(self.allocated_at_ns / 1e9, tz=timezone.utc)
 
 
 class TreasuryAgent:
@@ -59,12 +134,32 @@ class TreasuryAgent:
     allocating capital to individual trading agents.
     """
     
+    # Fee records kept in the history ring (fee totals and counts stay all-time)
+    FEE_HISTORY_MAX = 10_000
+    
+    # Per-agent stat columns start with this many rows and double when full
+    AGENT_TABLE_INITIAL_CAPACITY = 128
+    
     def __init__(self):
         self._running = False
         
         # Treasury state
         self.total_fees_collected: float = 0.0
-        self.fee_history: List[FeeDistribution] = []
+        self.total_distributed: float = 0.0
+        self._fee_count = 0
+        
+        # Fee history as a ring of NumPy records; slot is _fee_records_written % FEE_HISTORY_MAX
+        self._fee_records = np.zeros(self.FEE_HISTORY_MAX, dtype=_FEE_RECORD_DTYPE)
+        self._fee_records_written = 0
+        
+        # $AGENT bot-trading fee capital already credited by sync_from_fees
+        self._synced_fee_capital: float = 0.0
+        
+        # Running per-bucket fee totals
+        self._bot_total: float = 0.0
+        self._infra_total: float = 0.0
+        self._dev_total: float = 0.0
+        self._builder_total: float = 0.0
         
         # Current balances (in SOL)
         self.bot_trading_balance: float = 0.0
@@ -75,13 +170,42 @@ class TreasuryAgent:
         # Agent allocations
         self.agent_allocations: Dict[str, AgentAllocation] = {}
         
+        # Struct-of-arrays mirror of the allocations for vectorized ROI ranking
+        self._agent_row: Dict[str, int] = {}
+        self._allocations_by_row: List[AgentAllocation] = []
+        self._agent_pnl = np.zeros(self.AGENT_TABLE_INITIAL_CAPACITY)
+        self._agent_allocated = np.zeros(self.AGENT_TABLE_INITIAL_CAPACITY)
+        self._agent_current = np.zeros(self.AGENT_TABLE_INITIAL_CAPACITY)
+        self._agent_trades = np.zeros(self.AGENT_TABLE_INITIAL_CAPACITY, dtype=np.int64)
+        
+        # Allocation generation counter, bumped on every allocation change;
+        # the leaderboard is memoized against it
+        self._mutation_counter = 0
+        self._leaderboard_cache: Optional[Tuple[int, List[Dict]]] = None
+        
         # Config
         self.min_allocation_sol = 0.01
         self.max_allocation_sol = 0.5
+        
+        # Fee split fractions, resolved once from the tokenomics percentages
+        self._total_fee_frac = TOKENOMICS.TOTAL_FEE_PCT / 100
+        self._bot_frac = TOKENOMICS.BOT_TRADING_PCT / 100
+        self._infra_frac = TOKENOMICS.INFRASTRUCTURE_PCT / 100
+        self._dev_frac = TOKENOMICS.DEVELOPMENT_PCT / 100
+        self._builder_frac = TOKENOMICS.BUILDER_PCT / 100
+        self._split_fracs = np.array(
+            [self._bot_frac, self._infra_frac, self._dev_frac, self._builder_frac]
+        )
     
     async def start(self):
         """Initialize the treasury agent"""
         self._running = True
+        
+        # Compile (or load the cached) kernels before the first rebalance
+        if _rank_by_roi_jit is not None:
+            _rank_by_roi_jit(np.zeros(1), np.ones(1), 1.0)
+            _rebalance_bonuses_jit(np.zeros(1), np.zeros(1, dtype=np.intp), 0.0, 0.0)
+        
         logger.info("💰 Treasury Agent initialized")
     
     async def stop(self):
@@ -104,13 +228,13 @@ class TreasuryAgent:
         Fee = 2% of trade amount, split 4 ways
         """
         # Calculate total fee (2%)
-        total_fee = trade_amount_sol * (TOKENOMICS.TOTAL_FEE_PCT / 100)
+        total_fee = trade_amount_sol * self._total_fee_frac
         
         # Split to 4 buckets (25% each)
-        bot_share = total_fee * (TOKENOMICS.BOT_TRADING_PCT / 100)
-        infra_share = total_fee * (TOKENOMICS.INFRASTRUCTURE_PCT / 100)
-        dev_share = total_fee * (TOKENOMICS.DEVELOPMENT_PCT / 100)
-        builder_share = total_fee * (TOKENOMICS.BUILDER_PCT / 100)
+        bot_share = total_fee * self._bot_frac
+        infra_share = total_fee * self._infra_frac
+        dev_share = total_fee * self._dev_frac
+        builder_share = total_fee * self._builder_frac
         
         # Update balances
         self.bot_trading_balance += bot_share
@@ -118,8 +242,15 @@ class TreasuryAgent:
         self.development_balance += dev_share
         self.builder_balance += builder_share
         self.total_fees_collected += total_fee
+        self.total_distributed += total_fee
+        self._fee_count += 1
+        
+        self._bot_total += bot_share
+        self._infra_total += infra_share
+        self._dev_total += dev_share
+        self._builder_total += builder_share
         
-        # Create distribution record
+        # Create distribution record (immutable once created)
         distribution = FeeDistribution(
             total_fee_sol=total_fee,
             bot_trading=bot_share,
@@ -129,16 +260,77 @@ class TreasuryAgent:
             source_trade_id=trade_id
         )
         
-        self.fee_history.append(distribution)
-        
-        logger.debug(
-            f"💸 Fee collected: {total_fee:.6f} SOL "
-            f"(Bot: {bot_share:.6f}, Infra: {infra_share:.6f}, "
-            f"Dev: {dev_share:.6f}, Builder: {builder_share:.6f})"
+        self._fee_records[self._fee_records_written % self.FEE_HISTORY_MAX] = (
+            distribution.timestamp_ns, total_fee,
+            bot_share, infra_share, dev_share, builder_share, trade_id
         )
+        self._fee_records_written += 1
+        
+        # Per-trade path: skip the formatting unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"💸 Fee collected: {total_fee:.6f} SOL "
+                f"(Bot: {bot_share:.6f}, Infra: {infra_share:.6f}, "
+                f"Dev: {dev_share:.6f}, Builder: {builder_share:.6f})"
+            )
         
         return distribution
     
+    async def collect_fees_batch(self, trade_amounts_sol: np.ndarray) -> np.ndarray:
+        """
+        Collect and distribute fees from many trades at once (e.g. a block's settlements)
+        
+        Returns an (N, 5) array of total, bot, infra, dev and builder shares
+        per trade. Batched fees update balances and totals but are not added
+        to the fee history.
+        """
+        amounts = np.asarray(trade_amounts_sol, dtype=float).ravel()
+        
+        fees = np.empty((amounts.size, 5))
+        fees[:, 0] = amounts * self._total_fee_frac
+        fees[:, 1:] = fees[:, :1] * self._split_fracs
+        
+        total_fee, bot_share, infra_share, dev_share, builder_share = fees.sum(axis=0).tolist()
+        
+        # Update balances
+        self.bot_trading_balance += bot_share
+        self.infrastructure_balance += infra_share
+        self.development_balance += dev_share
+        self.builder_balance += builder_share
+        self.total_fees_collected += total_fee
+        self.total_distributed += total_fee
+        self._fee_count += amounts.size
+        
+        self._bot_total += bot_share
+        self._infra_total += infra_share
+        self._dev_total += dev_share
+        self._builder_total += builder_share
+        
+        logger.debug(f"💸 Fees collected from {amounts.size} trades: {total_fee:.6f} SOL")
+        
+        return fees
+    
+    async def sync_from_fees(self) -> float:
+        """
+        Credit the bot trading balance with $AGENT bot-trading fees collected
+        by the token manager since the last sync. Returns the amount credited.
+        """
+        # Imported here: the tokenomics package imports this module
+        from src.tokenomics.agent_token import get_token_manager, FeeAllocation
+        
+        bot_trading_total = get_token_manager().total_distributed[FeeAllocation.BOT_TRADING]
+        new_capital = bot_trading_total - self._synced_fee_capital
+        if new_capital <= 0:
+            return 0.0
+        
+        self._synced_fee_capital = bot_trading_total
+        self.bot_trading_balance += new_capital
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"💸 Synced {new_capital:.6f} SOL of $AGENT fee capital")
+        
+        return new_capital
+    
     # =========================================================================
     # CAPITAL ALLOCATION
     # =========================================================================
@@ -152,23 +344,23 @@ class TreasuryAgent:
         """
         Allocate capital from bot trading treasury to an agent
         """
-        if amount_sol > self.bot_trading_balance:
-            logger.warning(
-                f"Insufficient treasury balance: "
-                f"requested {amount_sol:.4f}, available {self.bot_trading_balance:.4f}"
-            )
-            return None
-        
-        if amount_sol < self.min_allocation_sol:
-            logger.warning(f"Allocation below minimum: {amount_sol:.4f} < {self.min_allocation_sol}")
+        # Single veto: the amount must meet the minimum and fit the treasury
+        if not self.min_allocation_sol <= amount_sol <= self.bot_trading_balance:
+            if amount_sol > self.bot_trading_balance:
+                logger.warning(
+                    f"Insufficient treasury balance: "
+                    f"requested {amount_sol:.4f}, available {self.bot_trading_balance:.4f}"
+                )
+            else:
+                logger.warning(f"Allocation below minimum: {amount_sol:.4f} < {self.min_allocation_sol}")
             return None
         
         # Deduct from treasury
         self.bot_trading_balance -= amount_sol
         
         # Create or update allocation
-        if agent_id in self.agent_allocations:
-            allocation = self.agent_allocations[agent_id]
+        allocation = self.agent_allocations.get(agent_id)
+        if allocation is not None:
             allocation.allocated_sol += amount_sol
             allocation.current_balance += amount_sol
         else:
@@ -180,7 +372,10 @@ class TreasuryAgent:
             )
             self.agent_allocations[agent_id] = allocation
         
-        logger.info(f"📊 Allocated {amount_sol:.4f} SOL to {agent_type} agent {agent_id[:8]}")
+        self._sync_agent_row(allocation)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"📊 Allocated {amount_sol:.4f} SOL to {agent_type} agent {agent_id[:8]}")
         
         return allocation
     
@@ -192,12 +387,11 @@ class TreasuryAgent:
         """
         Recall capital from an agent back to treasury
         """
-        if agent_id not in self.agent_allocations:
+        allocation = self.agent_allocations.get(agent_id)
+        if allocation is None:
             logger.warning(f"No allocation found for agent {agent_id}")
             return 0.0
         
-        allocation = self.agent_allocations[agent_id]
-        
         # Recall all if amount not specified
         if amount_sol is None:
             amount_sol = allocation.current_balance
@@ -206,6 +400,7 @@ class TreasuryAgent:
         
         # Update allocation
         allocation.current_balance -= amount_sol
+        self._sync_agent_row(allocation)
         
         # Return to treasury
         self.bot_trading_balance += amount_sol
@@ -224,17 +419,68 @@ class TreasuryAgent:
         """
         Update an agent's P&L and stats
         """
-        if agent_id not in self.agent_allocations:
+        allocation = self.agent_allocations.get(agent_id)
+        if allocation is None:
             return
-        
-        allocation = self.agent_allocations[agent_id]
         allocation.pnl += pnl
         allocation.current_balance += pnl
         allocation.trades_executed += trades
+        allocation.wins += wins
+        
+        self._sync_agent_row(allocation)
+    
+    async def update_agent_performance(
+        self,
+        agent_id: str,
+        pnl_change: float,
+        trades: int = 0,
+        wins: int = 0
+    ):
+        """
+        Update an agent's P&L and stats (entry point for the fee collector
+        and agent hooks)
+        """
+        await self.update_agent_pnl(agent_id, pnl_change, trades, wins)
+    
+    def _sync_agent_row(self, allocation: AgentAllocation):
+        """Copy an allocation's numeric stats into its struct-of-arrays row"""
+        self._mutation_counter += 1
+        
+        i = self._agent_row.get(allocation.agent_id)
+        if i is None:
+            i = len(self._allocations_by_row)
+            if i == len(self._agent_pnl):
+                self._agent_pnl = np.resize(self._agent_pnl, 2 * i)
+                self._agent_allocated = np.resize(self._agent_allocated, 2 * i)
+                self._agent_current = np.resize(self._agent_current, 2 * i)
+                self._agent_trades = np.resize(self._agent_trades, 2 * i)
+            self._agent_row[allocation.agent_id] = i
+            self._allocations_by_row.append(allocation)
+        
+        self._agent_pnl[i] = allocation.pnl
+        self._agent_allocated[i] = allocation.allocated_sol
+        self._agent_current[i] = allocation.current_balance
+        self._agent_trades[i] = allocation.trades_executed
+    
+    def _agent_roi(self) -> np.ndarray:
+        """ROI per allocation row (P&L over allocated capital)"""
+        n = len(self._allocations_by_row)
+        return self._agent_pnl[:n] / np.maximum(self._agent_allocated[:n], 0.001)
+    
+    def _rank_agents(self, scale: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (ROI per allocation row, rows ranked best first) via the numba kernel
+        when available, NumPy otherwise
+        """
+        n = len(self._allocations_by_row)
+        pnl = self._agent_pnl[:n]
+        allocated = self._agent_allocated[:n]
+        
+        if _rank_by_roi_jit is not None:
+            return _rank_by_roi_jit(pnl, allocated, scale)
         
-        if allocation.trades_executed > 0:
-            total_wins = int(allocation.win_rate * (allocation.trades_executed - trades) + wins)
-            allocation.win_rate = total_wins / allocation.trades_executed
+        roi = pnl / np.maximum(allocated, 0.001) * scale
+        return roi, np.argsort(-roi, kind="stable")
     
     # =========================================================================
     # REBALANCING
@@ -247,25 +493,27 @@ class TreasuryAgent:
         if not self.agent_allocations:
             return
         
-        # Sort agents by performance (ROI)
-        sorted_agents = sorted(
-            self.agent_allocations.values(),
-            key=lambda a: a.pnl / max(a.allocated_sol, 0.001),
-            reverse=True
+        # Select the top third by performance (ROI) without a full sort;
+        # nlargest is stable, so ties keep allocation order
+        roi = self._agent_roi()
+        roi_list = roi.tolist()
+        top_third = np.array(
+            heapq.nlargest(len(roi_list) // 3, range(len(roi_list)), key=roi_list.__getitem__),
+            dtype=np.intp
         )
         
-        # Top performers get more capital
-        for i, allocation in enumerate(sorted_agents):
-            if i < len(sorted_agents) // 3:  # Top third
-                roi = allocation.pnl / max(allocation.allocated_sol, 0.001)
-                if roi > 0.1:  # 10%+ ROI
-                    bonus = min(0.02, self.bot_trading_balance * 0.1)
-                    if bonus > 0:
-                        await self.allocate_to_agent(
-                            allocation.agent_id,
-                            allocation.agent_type,
-                            bonus
-                        )
+        # Top performers (10%+ ROI) get more capital
+        bonus_kernel = _rebalance_bonuses_jit or _rebalance_bonuses
+        bonuses = bonus_kernel(roi, top_third, self.bot_trading_balance, self.min_allocation_sol)
+        
+        for i, bonus in zip(top_third.tolist(), bonuses.tolist()):
+            if bonus > 0:
+                allocation = self._allocations_by_row[i]
+                await self.allocate_to_agent(
+                    allocation.agent_id,
+                    allocation.agent_type,
+                    bonus
+                )
         
         logger.info("📊 Agent capital rebalanced based on performance")
     
@@ -302,17 +550,26 @@ class TreasuryAgent:
             development_balance=self.development_balance,
             builder_balance=self.builder_balance,
             total_fees_collected=self.total_fees_collected,
-            total_distributed=sum(f.total_fee_sol for f in self.fee_history)
+            total_distributed=self.total_distributed
         )
     
     def get_agent_leaderboard(self) -> List[Dict]:
         """
         Get agents ranked by performance
+        
+        The list is cached until an allocation changes; treat it as read-only.
         """
+        cache = self._leaderboard_cache
+        if cache is not None and cache[0] == self._mutation_counter:
+            return cache[1]
+        
+        roi_pct, ranked = self._rank_agents(scale=100.0)
+        roi_pct = roi_pct.tolist()
+        
         leaderboard = []
         
-        for allocation in self.agent_allocations.values():
-            roi = (allocation.pnl / max(allocation.allocated_sol, 0.001)) * 100
+        for i in ranked.tolist():
+            allocation = self._allocations_by_row[i]
             
             leaderboard.append({
                 "agent_id": allocation.agent_id[:8],
@@ -320,18 +577,41 @@ class TreasuryAgent:
                 "allocated": allocation.allocated_sol,
                 "current": allocation.current_balance,
                 "pnl": allocation.pnl,
-                "roi_pct": roi,
+                "roi_pct": roi_pct[i],
                 "trades": allocation.trades_executed,
                 "win_rate": allocation.win_rate * 100
             })
         
-        return sorted(leaderboard, key=lambda x: x["roi_pct"], reverse=True)
+        self._leaderboard_cache = (self._mutation_counter, leaderboard)
+        return leaderboard
+    
+    def get_fee_history(self, limit: int = 50) -> List[FeeDistribution]:
+        """Most recent fee records (up to `limit`), oldest first"""
+        written = self._fee_records_written
+        n = min(limit, written, self.FEE_HISTORY_MAX)
+        if n <= 0:
+            return []
+        
+        slots = np.arange(written - n, written) % self.FEE_HISTORY_MAX
+        
+        return [
+            FeeDistribution(
+                timestamp_ns=ts,
+                total_fee_sol=total,
+                bot_trading=bot,
+                infrastructure=infra,
+                development=dev,
+                builder=builder,
+                source_trade_id=trade_id
+            )
+            for ts, total, bot, infra, dev, builder, trade_id in self._fee_records[slots].tolist()
+        ]
     
     def get_fee_stats(self) -> Dict:
         """
         Get fee collection statistics
         """
-        if not self.fee_history:
+        if not self._fee_count:
             return {
                 "total_collected": 0,
                 "distribution_count": 0,
@@ -340,22 +620,17 @@ class TreasuryAgent:
         
         return {
             "total_collected": self.total_fees_collected,
-            "distribution_count": len(self.fee_history),
-            "avg_fee": self.total_fees_collected / len(self.fee_history),
-            "bot_trading_total": sum(f.bot_trading for f in self.fee_history),
-            "infrastructure_total": sum(f.infrastructure for f in self.fee_history),
-            "development_total": sum(f.development for f in self.fee_history),
-            "builder_total": sum(f.builder for f in self.fee_history)
+            "distribution_count": self._fee_count,
+            "avg_fee": self.total_fees_collected / self._fee_count,
+            "bot_trading_total": self._bot_total,
+            "infrastructure_total": self._infra_total,
+            "development_total": self._dev_total,
+            "builder_total": self._builder_total
         }
 
 
 # Singleton instance
-_treasury_agent: Optional[TreasuryAgent] = None
-
-
+@lru_cache(maxsize=None)
 def get_treasury_agent() -> TreasuryAgent:
     """Get or create the treasury agent singleton"""
-    global _treasury_agent
-    if _treasury_agent is None:
-        _treasury_agent = TreasuryAgent()
-    return _treasury_agent
+    return TreasuryAgent()
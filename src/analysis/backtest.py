@@ -1,26 +1,116 @@
 """
 Backtesting Engine - Historical Strategy Replay
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the replay then runs as plain Python
+    njit = None
+
+# Strategy signals as codes for the replay kernel
+_SIGNAL_BUY = 1
+_SIGNAL_SELL = -1
+
+# NumPy dtype kinds a sweep can place in shared memory (bool, int, float,
+# complex, timedelta, datetime)
+_SHAREABLE_KINDS = "biufcmM"
+
+
+def _simulate(close, signals, amount, open_price, open_amount, open_row, n_open):
+    """
+    Bar-by-bar replay of BUY (1) / SELL (-1) signals against close prices.
+    
+    Open positions form a LIFO stack in the open_* arrays (first n_open rows
+    in use, room for one more per bar); a SELL closes the most recent one.
+    Returns per-trade entry price, entry row (negative if carried over),
+    exit row and P&L, plus the trade count and open-stack size.
+    Compiled with numba when it is installed.
+    """
+    n = close.shape[0]
+    trade_entry_price = np.empty(n)
+    trade_entry_row = np.empty(n, dtype=np.int64)
+    trade_exit_row = np.empty(n, dtype=np.int64)
+    trade_pnl = np.empty(n)
+    n_trades = 0
+    
+    for i in range(n):
+        if signals[i] == 1:
+            open_price[n_open] = close[i]
+            open_amount[n_open] = amount
+            open_row[n_open] = i
+            n_open += 1
+        
+        elif signals[i] == -1 and n_open > 0:
+            n_open -= 1
+            
+            trade_entry_price[n_trades] = open_price[n_open]
+            trade_entry_row[n_trades] = open_row[n_open]
+            trade_exit_row[n_trades] = i
+            trade_pnl[n_trades] = open_amount[n_open] * (close[i] - open_price[n_open])
+            n_trades += 1
+    
+    return (
+        trade_entry_price, trade_entry_row, trade_exit_row, trade_pnl,
+        n_trades, n_open
+    )
+
+
+# fastmath is left off so P&L matches the Python arithmetic exactly
+_simulate_jit = njit(cache=True)(_simulate) if njit is not None else None
+
+
+# strategy_func(history) -> "BUY", "SELL" or None
+StrategyFunc = Callable[[pd.DataFrame], Optional[str]]
+
+
 class BacktestEngine:
     """Replay trades against historical data"""
     
     def __init__(self, starting_balance: float = 25.0):
-        self.starting_balance = starting_balance
-        self.current_balance = starting_balance
-        self.trades = []
-        self.positions = []
+        self.starting_balance: float = starting_balance
+        self.current_balance: float = starting_balance
+        self.trades: List[Dict[str, Any]] = []
+        
+        # Open positions as a LIFO stack: rows [0, _n_open) of these arrays
+        self._open_price = np.empty(0)
+        self._open_amount = np.empty(0)
+        self._open_time = np.empty(0, dtype=object)
+        self._n_open: int = 0
+    
+    @property
+    def positions(self) -> List[Dict[str, Any]]:
+        """Open positions, oldest first (built on demand)"""
+        return [
+            {
+                "entry_price": float(self._open_price[j]),
+                "entry_time": self._open_time[j],
+                "amount_sol": float(self._open_amount[j]),
+                "status": "OPEN"
+            }
+            for j in range(self._n_open)
+        ]
     
     def execute_backtest(
         self,
         historical_data: pd.DataFrame,
-        strategy_func,
-        max_position_size: float = 0.05
+        strategy_func: StrategyFunc,
+        max_position_size: float = 0.05,
+        lookback: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Run backtest simulation"""
+        """
+        Run backtest simulation
+        
+        strategy_func sees the candles before the current bar: all of them,
+        or only the last `lookback` when set (keeps each call O(lookback)).
+        """
         
         results = {
             "total_trades": 0,
@@ -32,39 +122,79 @@ class BacktestEngine:
             "final_balance": self.starting_balance
         }
         
-        # Iterate through historical candles
-        for idx, candle in historical_data.iterrows():
-            signal = strategy_func(historical_data[:idx])
+        # Columns the loop reads, extracted once as NumPy arrays
+        close = historical_data['close'].to_numpy(dtype=np.float64)
+        timestamps = historical_data['timestamp'].to_numpy()
+        n = len(historical_data)
+        
+        # Collect strategy signals for every bar (the strategy is plain Python)
+        signals = np.zeros(n, dtype=np.int8)
+        for i in range(n):
+            start = 0 if lookback is None else max(0, i - lookback)
+            signal = strategy_func(historical_data.iloc[start:i])
             
             if signal == "BUY":
-                position = {
-                    "entry_price": candle['close'],
-                    "entry_time": candle['timestamp'],
-                    "amount_sol": max_position_size,
-                    "status": "OPEN"
-                }
-                self.positions.append(position)
-            
-            elif signal == "SELL" and self.positions:
-                position = self.positions.pop()
-                exit_price = candle['close']
-                pnl = position['amount_sol'] * (exit_price - position['entry_price'])
-                
-                self.trades.append({
-                    "entry": position['entry_price'],
-                    "exit": exit_price,
-                    "pnl": pnl,
-                    "duration": candle['timestamp'] - position['entry_time']
-                })
-                
-                self.current_balance += pnl
-                
-                if pnl > 0:
-                    results["winning_trades"] += 1
-                else:
-                    results["losing_trades"] += 1
-                
-                results["total_trades"] += 1
+                signals[i] = _SIGNAL_BUY
+            elif signal == "SELL":
+                signals[i] = _SIGNAL_SELL
+        
+        # Position stack: positions carried over from earlier runs, then room
+        # for one more per bar
+        n_carried = self._n_open
+        carried_time = self._open_time
+        capacity = n_carried + n
+        open_price = np.empty(capacity)
+        open_amount = np.empty(capacity)
+        open_row = np.empty(capacity, dtype=np.int64)
+        open_price[:n_carried] = self._open_price[:n_carried]
+        open_amount[:n_carried] = self._open_amount[:n_carried]
+        # Carried rows are negative: row r is carried position -1 - r
+        open_row[:n_carried] = np.arange(-1, -1 - n_carried, -1)
+        
+        # Replay signals bar by bar
+        simulate = _simulate_jit or _simulate
+        entry_price, entry_row, exit_row, trade_pnl, n_trades, n_open = simulate(
+            close, signals, max_position_size,
+            open_price, open_amount, open_row, n_carried
+        )
+        trade_pnl = trade_pnl[:n_trades]
+        
+        for k in range(n_trades):
+            row = int(entry_row[k])
+            entry_time = timestamps[row] if row >= 0 else carried_time[-1 - row]
+            self.trades.append({
+                "entry": entry_price[k],
+                "exit": close[exit_row[k]],
+                "pnl": trade_pnl[k],
+                "duration": timestamps[exit_row[k]] - entry_time
+            })
+        
+        # Keep the remaining stack for the next run
+        rows = open_row[:n_open]
+        is_new = rows >= 0
+        open_time = np.empty(n_open, dtype=object)
+        open_time[is_new] = timestamps[rows[is_new]]
+        open_time[~is_new] = carried_time[-1 - rows[~is_new]]
+        
+        self._open_price = open_price
+        self._open_amount = open_amount
+        self._open_time = open_time
+        self._n_open = n_open
+        
+        # Aggregate trade results: balance after each trade (cumsum adds in
+        # trade order, like the running balance) and drawdown from its peak
+        equity = np.empty(n_trades + 1)
+        equity[0] = self.current_balance
+        equity[1:] = trade_pnl
+        np.cumsum(equity, out=equity)
+        
+        wins = int((trade_pnl > 0).sum())
+        
+        self.current_balance = float(equity[-1])
+        results["total_trades"] = int(n_trades)
+        results["winning_trades"] = wins
+        results["losing_trades"] = int(n_trades) - wins
+        results["max_drawdown"] = float((np.maximum.accumulate(equity) - equity).max())
         
         # Calculate metrics
         if results["total_trades"] > 0:
@@ -74,5 +204,92 @@ class BacktestEngine:
         results["final_balance"] = self.current_balance
         
         return results
+    
+    def sweep(
+        self,
+        historical_data: pd.DataFrame,
+        strategies: List[StrategyFunc],
+        max_position_size: float = 0.05,
+        lookback: Optional[int] = None,
+        n_workers: Optional[int] = None,
+        mp_context=None
+    ) -> List[Dict[str, Any]]:
+        """
+        Backtest each strategy independently across worker processes
+        
+        Every strategy gets a fresh engine with this engine's starting balance;
+        results come back in strategy order. Numeric and datetime columns are
+        written once to shared memory rather than pickled per task; other
+        columns (e.g. strings) and the index are pickled alongside each task.
+        Strategies must be picklable (module-level); mp_context is passed to
+        the ProcessPoolExecutor.
+        """
+        # Only plain NumPy numeric/datetime columns can be shared as raw bytes;
+        # object and extension columns (strings, categoricals) hold pointers
+        # that are meaningless in another process, so they are pickled
+        columns = list(historical_data.columns)
+        shareable = [
+            isinstance(dtype, np.dtype) and dtype.kind in _SHAREABLE_KINDS
+            for dtype in historical_data.dtypes
+        ]
+        shared_columns = [c for c, ok in zip(columns, shareable) if ok]
+        pickled = historical_data[[c for c, ok in zip(columns, shareable) if not ok]]
+        
+        if shared_columns:
+            records = historical_data[shared_columns].to_records(index=False)
+        else:
+            records = np.empty(len(historical_data), dtype=[])
+        shm = SharedMemory(create=True, size=max(records.nbytes, 1))
+        try:
+            shared = np.ndarray(records.shape, dtype=records.dtype, buffer=shm.buf)
+            shared[:] = records
+            del shared
+            
+            with ProcessPoolExecutor(
+                max_workers=n_workers or os.cpu_count(), mp_context=mp_context
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _sweep_worker, shm.name, records.dtype, len(records),
+                        pickled, columns,
+                        self.starting_balance, strategy_func, max_position_size, lookback
+                    )
+                    for strategy_func in strategies
+                ]
+                return [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+def _sweep_worker(
+    shm_name: str,
+    dtype: np.dtype,
+    n_rows: int,
+    pickled: pd.DataFrame,
+    columns: List[Any],
+    starting_balance: float,
+    strategy_func: StrategyFunc,
+    max_position_size: float,
+    lookback: Optional[int]
+) -> Dict[str, Any]:
+    """Run one sweep strategy in a worker process against the shared candles"""
+    shm = SharedMemory(name=shm_name)
+    try:
+        records = np.ndarray((n_rows,), dtype=dtype, buffer=shm.buf)
+        historical_data = pd.DataFrame.from_records(records, index=pickled.index)
+        del records  # Release the buffer view so the block can be closed
+    finally:
+        shm.close()
+    
+    # Reassemble the original frame: pickled columns back in, original order
+    for name in pickled.columns:
+        historical_data[name] = pickled[name]
+    historical_data = historical_data[columns]
+    
+    engine = BacktestEngine(starting_balance)
+    return engine.execute_backtest(
+        historical_data, strategy_func, max_position_size, lookback
+    )
 
 backtest_engine = BacktestEngine()
@@ -5,16 +5,19 @@ Coordinates all agents and manages the trading pipeline.
 
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Any
+from dataclasses import dataclass
 
 from src.constants import (
-    PAPER_TRADING, MAINNET_ENABLED, TradingThresholds,
-    Strategy, ACTIVE_STRATEGY, RISK_WARNING
+    MAINNET_ENABLED, TradingThresholds, ACTIVE_STRATEGY, RISK_WARNING
 )
-from src.types import TokenInfo, TradeSignal, Trade, Position, SystemHealth
+from src.types import TokenInfo, TradeSignal, SystemHealth
+from src.services.http_session import close_shared_session
 from src.agents import (
+    ScoutAgent, SentimentAgent, ArbiterAgent, SniperAgent,
+    SellAgent, TreasuryAgent, AgentSpawner,
     get_scout_agent, get_sentiment_agent, get_arbiter_agent,
     get_sniper_agent, get_sell_agent, get_treasury_agent,
     get_agent_spawner
@@ -22,26 +25,8 @@ from src.agents import (
 
 logger = logging.getLogger(__name__)
 
-from src.agents.ceo_agent import CEOAgent
 
-class CommandCenter:
-    def __init__(self):
-        self.ceo = CEOAgent()
-        self.scout = ScoutAgent()
-        self.sentiment = SentimentAgent()
-        # ... other agents
-
-    def process_signal(self, signal: TradeSignal):
-        decision = self.ceo.allocate_resources(signal)
-        if decision.action == "trade":
-            # Delegate to other agents
-            sentiment_score = self.sentiment.analyze(signal.token)
-            arbiter_decision = self.arbiter.decide(signal, sentiment_score)
-            if arbiter_decision.action == "buy":
-                self.sniper.execute_trade(arbiter_decision)
-
-
-@dataclass
+@dataclass(slots=True)
 class SystemState:
     """Current system state"""
     is_running: bool = False
@@ -79,26 +64,27 @@ class CommandCenter:
         self.state = SystemState()
         
         # Agents (initialized lazily)
-        self.scout = None
-        self.sentiment = None
-        self.arbiter = None
-        self.sniper = None
-        self.sell = None
-        self.treasury = None
-        self.spawner = None
+        self.scout: Optional[ScoutAgent] = None
+        self.sentiment: Optional[SentimentAgent] = None
+        self.arbiter: Optional[ArbiterAgent] = None
+        self.sniper: Optional[SniperAgent] = None
+        self.sell: Optional[SellAgent] = None
+        self.treasury: Optional[TreasuryAgent] = None
+        self.spawner: Optional[AgentSpawner] = None
         
         # Configuration
-        self.discovery_interval_secs = 30
-        self.position_check_interval_secs = 10
+        self.discovery_interval_secs: float = 30
+        self.position_check_interval_secs: float = 10
         
         # Data
         self.discovered_tokens: Dict[str, TokenInfo] = {}
-        self.signal_queue: List[TradeSignal] = []
+        self._price_view: Dict[str, float] = {}  # mint -> last discovered price_usd
+        self.signal_queue: Deque[TradeSignal] = deque()
         
         # Tasks
-        self._discovery_task = None
-        self._monitoring_task = None
-        self._main_loop_task = None
+        self._discovery_task: Optional[asyncio.Task] = None
+        self._monitoring_task: Optional[asyncio.Task] = None
+        self._main_loop_task: Optional[asyncio.Task] = None
     
     # =========================================================================
     # LIFECYCLE
@@ -115,14 +101,24 @@ class CommandCenter:
         if MAINNET_ENABLED:
             logger.warning(RISK_WARNING)
         
-        # Initialize agents
-        self.scout = get_scout_agent()
-        self.sentiment = get_sentiment_agent()
-        self.arbiter = get_arbiter_agent()
-        self.sniper = get_sniper_agent()
-        self.sell = get_sell_agent()
-        self.treasury = get_treasury_agent()
-        self.spawner = get_agent_spawner()
+        # Initialize agents (constructors may block, so run them in threads)
+        (
+            self.scout,
+            self.sentiment,
+            self.arbiter,
+            self.sniper,
+            self.sell,
+            self.treasury,
+        ) = await asyncio.gather(
+            asyncio.to_thread(get_scout_agent),
+            asyncio.to_thread(get_sentiment_agent),
+            asyncio.to_thread(get_arbiter_agent),
+            asyncio.to_thread(get_sniper_agent),
+            asyncio.to_thread(get_sell_agent),
+            asyncio.to_thread(get_treasury_agent),
+        )
+        # The spawner looks up the treasury singleton, so build it afterwards
+        self.spawner = await asyncio.to_thread(get_agent_spawner)
         
         # Start all agents
         await asyncio.gather(
@@ -154,21 +150,22 @@ class CommandCenter:
             if task:
                 task.cancel()
         
-        # Stop all agents
-        if self.scout:
-            await self.scout.stop()
-        if self.sentiment:
-            await self.sentiment.stop()
-        if self.arbiter:
-            await self.arbiter.stop()
-        if self.sniper:
-            await self.sniper.stop()
-        if self.sell:
-            await self.sell.stop()
-        if self.treasury:
-            await self.treasury.stop()
-        if self.spawner:
-            await self.spawner.stop()
+        # Stop all agents concurrently; one failing stop() doesn't block the rest
+        agents = [
+            agent for agent in (
+                self.scout, self.sentiment, self.arbiter, self.sniper,
+                self.sell, self.treasury, self.spawner
+            )
+            if agent
+        ]
+        results = await asyncio.gather(
+            *(agent.stop() for agent in agents), return_exceptions=True
+        )
+        for agent, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.error(f"{type(agent).__name__} stop error: {result}")
+        
+        await close_shared_session()
         
         logger.info("✅ Command Center shutdown complete")
     
@@ -252,28 +249,27 @@ class CommandCenter:
         
         for token in safe_tokens:
             self.discovered_tokens[token.mint] = token
+            self._price_view[token.mint] = token.price_usd
         
         # 2. Analyze sentiment
         sentiment_results = await self.sentiment.analyze_multiple(safe_tokens)
         
-        # 3. Generate trading signals
-        for token in safe_tokens:
-            rug_check = self.scout.vetted_tokens.get(token.mint)
-            sentiment = sentiment_results.get(token.mint)
-            
-            # Check if we already have a position
-            existing_position = self.sniper.get_position(token.mint)
-            
-            signal = await self.arbiter.evaluate_and_signal(
-                token=token,
-                rug_check=rug_check,
-                sentiment=sentiment,
-                existing_position=existing_position
-            )
-            
-            if signal:
-                self.signal_queue.append(signal)
-                self.state.signals_generated += 1
+        # 3. Generate trading signals (one batched scoring pass)
+        existing_positions = {
+            token.mint: self.sniper.get_position(token.mint) for token in safe_tokens
+        }
+        signals = await self.arbiter.evaluate_and_signal_batch(
+            safe_tokens,
+            rug_checks=self.scout.vetted_tokens,
+            sentiments=sentiment_results,
+            existing_positions=existing_positions
+        )
+        
+        new_signals = [signal for signal in signals if signal is not None]
+        self.signal_queue.extend(new_signals)
+        for signal in new_signals:
+            self.sniper.prefetch_quote(signal)
+        self.state.signals_generated += len(new_signals)
         
         # 4. Execute signals (if not paused)
         await self._process_signal_queue()
@@ -289,27 +285,25 @@ class CommandCenter:
         if self.state.is_paused:
             return
         
-        # Check position limits
-        current_positions = len(self.sniper.get_all_positions())
+        # Check position limits against the live position map (O(1) per signal)
+        open_positions = self.sniper.open_positions
         max_positions = TradingThresholds.MAX_CONCURRENT_POSITIONS
         
-        while self.signal_queue and current_positions < max_positions:
-            signal = self.signal_queue.pop(0)
+        while self.signal_queue and len(open_positions) < max_positions:
+            signal = self.signal_queue.popleft()
             
             # Execute via sniper
             trade = await self.sniper.execute_signal(signal)
             
             if trade:
                 self.state.trades_executed += 1
-                self.state.last_trade = datetime.now(timezone.utc)
+                self.state.last_trade = trade.executed_at  # Stamped by the sniper on confirm
                 
                 # Collect fees (simulate for paper trading)
                 await self.treasury.collect_fee(
                     trade_amount_sol=trade.amount_sol,
                     trade_id=trade.trade_id
                 )
-                
-                current_positions = len(self.sniper.get_all_positions())
         
         self.state.pending_signals = len(self.signal_queue)
     
@@ -346,14 +340,12 @@ class CommandCenter:
         self.state.active_positions = len(positions)
         
         # Get current prices for all positions
-        current_prices = {}
-        for position in positions:
-            token = self.discovered_tokens.get(position.mint)
-            if token:
-                current_prices[position.mint] = token.price_usd
+        price_view = self._price_view
+        current_prices = {p.mint: price_view[p.mint] for p in positions if p.mint in price_view}
         
         # Check for exit signals
         exit_signals = await self.sell.check_positions(positions, current_prices)
+        self.sniper.mark_positions_updated()  # check_positions re-priced them
         
         # Execute exits
         for signal in exit_signals:
@@ -381,7 +373,7 @@ class CommandCenter:
         logger.warning("⚠️ Emergency sell all triggered")
         
         positions = self.sniper.get_all_positions()
-        exit_signals = await self.sell.emergency_exit_all(positions)
+        exit_signals = await self.sell.emergency_exit_all(positions, self.discovered_tokens)
         
         for signal in exit_signals:
             await self.sniper.execute_signal(signal)
@@ -405,7 +397,7 @@ class CommandCenter:
             rpc_connected=True,  # Would check actual connection
             dexscreener_ok=True,
             rugcheck_ok=True,
-            active_agents=len(self.spawner.get_active_agents()) if self.spawner else 0,
+            active_agents=self.spawner.active_agent_count if self.spawner else 0,
             open_positions=self.state.active_positions,
             pending_signals=self.state.pending_signals
         )
@@ -440,26 +432,8 @@ class CommandCenter:
             },
             "swarm": swarm_stats,
             "paper_balance": self.sniper.get_paper_balance() if self.sniper else 1.0,
-            "positions": [
-                {
-                    "symbol": p.symbol,
-                    "entry": p.entry_price,
-                    "current": p.current_price,
-                    "pnl_pct": p.unrealized_pnl_pct,
-                    "pnl_sol": p.unrealized_pnl_sol,
-                }
-                for p in (self.sniper.get_all_positions() if self.sniper else [])
-            ],
-            "recent_trades": [
-                {
-                    "symbol": t.symbol,
-                    "action": t.action.value,
-                    "amount": t.amount_sol,
-                    "pnl": t.pnl_sol,
-                    "status": t.status.value,
-                }
-                for t in (self.sniper.get_trade_history(10) if self.sniper else [])
-            ],
+            "positions": self.sniper.get_position_rows() if self.sniper else [],
+            "recent_trades": self.sniper.get_trade_rows(10) if self.sniper else [],
             "leaderboard": self.spawner.get_leaderboard(10) if self.spawner else [],
         }
 
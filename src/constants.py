@@ -12,18 +12,73 @@ from typing import Optional
 # ENVIRONMENT CONFIGURATION
 # =============================================================================
 
-MAINNET_ENABLED = os.getenv("MAINNET_ENABLED", "false").lower() == "true"
-PAPER_TRADING = not MAINNET_ENABLED
+def _env_bool(name: str, default: str = "false") -> bool:
+    """Parse a "true"/"false" environment flag"""
+    return os.getenv(name, default).lower() == "true"
 
-# Solana RPC endpoints
-SOLANA_RPC_MAINNET = os.getenv("SOLANA_RPC_MAINNET", "https://api.mainnet-beta.solana.com")
-SOLANA_RPC_DEVNET = os.getenv("SOLANA_RPC_DEVNET", "https://api.devnet.solana.com")
-SOLANA_RPC = SOLANA_RPC_MAINNET if MAINNET_ENABLED else SOLANA_RPC_DEVNET
 
-# Jito for MEV protection
-JITO_BLOCK_ENGINE = os.getenv("JITO_BLOCK_ENGINE", "https://mainnet.block-engine.jito.wtf")
-JITO_TIP_ACCOUNT = os.getenv("JITO_TIP_ACCOUNT", "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5")
-JITO_TIP_LAMPORTS = int(os.getenv("JITO_TIP_LAMPORTS", "10000"))
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Deployment settings read from the environment once, at import"""
+    mainnet_enabled: bool
+    
+    # Solana RPC endpoints
+    solana_rpc_mainnet: str
+    solana_rpc_devnet: str
+    
+    # Jito for MEV protection
+    jito_block_engine: str
+    jito_tip_account: str
+    jito_tip_lamports: int
+    
+    # Redis for caches shared across workers (empty = in-process caching only)
+    redis_url: str
+    
+    # Logging & debug
+    log_level: str
+    debug_mode: bool
+    
+    @property
+    def paper_trading(self) -> bool:
+        """Paper trading is on whenever mainnet is off"""
+        return not self.mainnet_enabled
+    
+    @property
+    def solana_rpc(self) -> str:
+        """RPC endpoint for the active network"""
+        return self.solana_rpc_mainnet if self.mainnet_enabled else self.solana_rpc_devnet
+    
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Build the config from the current environment"""
+        return cls(
+            mainnet_enabled=_env_bool("MAINNET_ENABLED"),
+            solana_rpc_mainnet=os.getenv("SOLANA_RPC_MAINNET", "https://api.mainnet-beta.solana.com"),
+            solana_rpc_devnet=os.getenv("SOLANA_RPC_DEVNET", "https://api.devnet.solana.com"),
+            jito_block_engine=os.getenv("JITO_BLOCK_ENGINE", "https://mainnet.block-engine.jito.wtf"),
+            jito_tip_account=os.getenv("JITO_TIP_ACCOUNT", "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5"),
+            jito_tip_lamports=int(os.getenv("JITO_TIP_LAMPORTS", "10000")),
+            redis_url=os.getenv("REDIS_URL", ""),
+            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            debug_mode=_env_bool("DEBUG_MODE"),
+        )
+
+
+CONFIG = Config.from_env()
+
+# Module-level names for `from src.constants import ...` (bound once, read as globals)
+MAINNET_ENABLED = CONFIG.mainnet_enabled
+PAPER_TRADING = CONFIG.paper_trading
+
+SOLANA_RPC_MAINNET = CONFIG.solana_rpc_mainnet
+SOLANA_RPC_DEVNET = CONFIG.solana_rpc_devnet
+SOLANA_RPC = CONFIG.solana_rpc
+
+JITO_BLOCK_ENGINE = CONFIG.jito_block_engine
+JITO_TIP_ACCOUNT = CONFIG.jito_tip_account
+JITO_TIP_LAMPORTS = CONFIG.jito_tip_lamports
+
+REDIS_URL = CONFIG.redis_url
 
 # =============================================================================
 # API ENDPOINTS
@@ -84,6 +139,7 @@ class TradingThresholds:
     MIN_LIQUIDITY_USD = float(os.getenv("MIN_LIQUIDITY_USD", "10000"))
     MAX_HONEYPOT_SCORE = float(os.getenv("MAX_HONEYPOT_SCORE", "0.3"))
     MIN_SENTIMENT_SCORE = float(os.getenv("MIN_SENTIMENT_SCORE", "2.0"))
+    MAX_VET_CONCURRENCY = int(os.getenv("MAX_VET_CONCURRENCY", "10"))
     
     # Rate limiting
     MAX_TRADES_PER_HOUR = int(os.getenv("MAX_TRADES_PER_HOUR", "20"))
@@ -182,8 +238,8 @@ SWARM = SwarmConfig()
 # LOGGING & DEBUG
 # =============================================================================
 
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
+LOG_LEVEL = CONFIG.log_level
+DEBUG_MODE = CONFIG.debug_mode
 
 
 # =============================================================================
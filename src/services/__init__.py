@@ -3,4 +3,12 @@ SOL-SWARM Elite Services
 API integrations and external service clients.
 """
 
+from src.services.http_session import get_shared_session, close_shared_session
+from src.services.circuit_breaker import CircuitBreaker, CircuitState
+
+__all__ = [
+    "get_shared_session", "close_shared_session",
+    "CircuitBreaker", "CircuitState",
+]
+
 # Future: DexScreener, Birdeye, Helius clients
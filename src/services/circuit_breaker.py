@@ -0,0 +1,91 @@
+"""
+Circuit Breaker
+Short-circuits calls to an upstream API while it is failing.
+"""
+
+import logging
+import time
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """Breaker states"""
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Failing - reject calls until recovery window passes
+    HALF_OPEN = "half_open"  # Probing - let a limited number of calls through
+
+
+class CircuitBreaker:
+    """
+    Per-provider CLOSED → OPEN → HALF_OPEN state machine.
+
+    - CLOSED: calls pass; consecutive failures are counted
+    - OPEN: after `failure_threshold` failures, calls are rejected for
+      `recovery_secs`
+    - HALF_OPEN: up to `half_open_max` probe calls pass; a success closes
+      the breaker, a failure re-opens it
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_secs: float = 30.0,
+        half_open_max: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_secs = recovery_secs
+        self.half_open_max = half_open_max
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be rejected"""
+        return (
+            self.state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at < self.recovery_secs
+        )
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, advancing OPEN → HALF_OPEN"""
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.recovery_secs:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+
+        if self._half_open_calls < self.half_open_max:
+            self._half_open_calls += 1
+            return True
+
+        return False
+
+    def on_success(self):
+        """Record a successful call"""
+        if self.state is not CircuitState.CLOSED:
+            logger.info(f"🟢 Circuit closed for {self.name}")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def on_failure(self):
+        """Record a failed call"""
+        self.failures += 1
+
+        if self.state is CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state is not CircuitState.OPEN:
+                logger.warning(
+                    f"🔴 Circuit opened for {self.name} "
+                    f"({self.failures} failures, retry in {self.recovery_secs:.0f}s)"
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
@@ -0,0 +1,70 @@
+"""
+Shared HTTP Session
+One pooled aiohttp ClientSession reused by every agent in the process.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Connection pool settings
+HTTP_TIMEOUT_SECS = 30
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+HTTP_DNS_CACHE_TTL_SECS = 300
+HTTP_KEEPALIVE_SECS = 75
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _orjson_dumps(obj) -> str:
+    """orjson serializer for request bodies (aiohttp expects str)"""
+    return orjson.dumps(obj).decode()
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get or create the process-wide HTTP session.
+
+    Creation happens without awaiting, so concurrent callers on the same
+    event loop always see the same session. A new session is built if the
+    previous one was closed or belongs to a different event loop (e.g. after
+    a fresh asyncio.run()).
+    """
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL_SECS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECS,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECS),
+            cookie_jar=aiohttp.DummyCookieJar(),
+            json_serialize=_orjson_dumps,
+        )
+        _session_loop = loop
+        logger.debug("🌐 Shared HTTP session created")
+
+    return _session
+
+
+async def close_shared_session():
+    """Close the process-wide HTTP session (call once at app shutdown)"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+    _session = None
+    _session_loop = None
@@ -3,10 +3,13 @@ SOL-SWARM Elite Type Definitions
 All data structures used across the system.
 """
 
+import secrets
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from enum import Enum
+from itertools import count
 
 
 # =============================================================================
@@ -132,6 +135,12 @@ class TradeStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# Signal ids: per-process random nonce + counter (no urandom read per signal),
+# the same scheme as the sniper's trade ids
+_signal_nonce = secrets.token_hex(2)
+_signal_counter = count()
+
+
 @dataclass
 class TradeSignal:
     """A trading signal from an agent"""
@@ -157,6 +166,9 @@ class TradeSignal:
     strategy: str = ""
     
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    # Identifies the signal across agents (e.g. for prefetched quotes)
+    signal_id: str = field(default_factory=lambda: f"{_signal_nonce}{next(_signal_counter):04x}")
 
 
 @dataclass
@@ -217,6 +229,9 @@ class Position:
     stop_loss_price: float = 0.0
     take_profit_price: float = 0.0
     
+    # High-water mark for trailing stops (defaults to entry_price)
+    highest_price: float = 0.0
+    
     # Tracking
     agent_id: str = ""
     entry_trade_id: str = ""
@@ -224,6 +239,13 @@ class Position:
     opened_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     last_updated: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     
+    # Monotonic open time used for age checks (opened_at is for display/serialization)
+    opened_at_monotonic: float = field(default_factory=time.monotonic)
+    
+    def __post_init__(self):
+        if not self.highest_price:
+            self.highest_price = self.entry_price
+    
     def update_pnl(self, current_price: float):
         """Update unrealized P&L based on current price"""
         self.current_price = current_price
@@ -0,0 +1,119 @@
+"""Arbiter scoring tests"""
+import random
+
+import pytest
+
+
+# Exact threshold values used by the scoring ladders, so boundaries are hit
+_P5 = [-10.0, -5.0, 5.0, 10.0]
+_P1H = [-20.0, -10.0, 10.0, 20.0]
+_VOLUME = [50_000.0, 100_000.0]
+_LIQUIDITY = [10_000.0, 50_000.0]
+_MENTIONS = [50, 100]
+_TOP10 = [40.0, 60.0, 80.0]
+
+
+def _pick(rng: random.Random, edges, low: float, high: float) -> float:
+    """Either an exact ladder threshold or a uniform draw"""
+    return rng.choice(edges) if rng.random() < 0.3 else rng.uniform(low, high)
+
+
+def _random_inputs(n: int = 3000, seed: int = 11):
+    """Random tokens with optional rug checks and sentiment, keyed by mint"""
+    from src.types import TokenInfo, RugCheckResult, SentimentResult
+    
+    rng = random.Random(seed)
+    tokens, rug_checks, sentiments = [], {}, {}
+    
+    for i in range(n):
+        mint = f"mint{i}"
+        tokens.append(TokenInfo(
+            mint=mint,
+            symbol=f"T{i}",
+            name=f"Token {i}",
+            price_usd=rng.uniform(0.0001, 2.0),
+            liquidity_usd=_pick(rng, _LIQUIDITY, 0, 200_000),
+            volume_24h_usd=_pick(rng, _VOLUME, 0, 500_000),
+            market_cap_usd=rng.uniform(0, 10_000_000),
+            price_change_5m=_pick(rng, _P5, -30, 30),
+            price_change_1h=_pick(rng, _P1H, -60, 80),
+            price_change_24h=rng.uniform(-90, 300),
+        ))
+        
+        if rng.random() < 0.8:
+            rug_checks[mint] = RugCheckResult(
+                mint=mint,
+                is_safe=rng.random() < 0.8,
+                honeypot_score=rng.uniform(0, 0.6),
+                overall_risk=rng.random(),
+                is_honeypot=rng.random() < 0.1,
+                is_mintable=rng.random() < 0.3,
+                is_freezable=rng.random() < 0.3,
+                has_blacklist=rng.random() < 0.2,
+                mint_authority_revoked=rng.random() < 0.7,
+                freeze_authority_revoked=rng.random() < 0.7,
+                top10_holder_pct=_pick(rng, _TOP10, 5, 100),
+            )
+        
+        if rng.random() < 0.8:
+            sentiments[mint] = SentimentResult(
+                mint=mint,
+                symbol=f"T{i}",
+                overall_score=rng.uniform(-10, 10),
+                total_mentions=int(_pick(rng, _MENTIONS, 0, 500)),
+                is_trending=rng.random() < 0.3,
+            )
+    
+    return tokens, rug_checks, sentiments
+
+
+def _fields(analysis):
+    return (
+        analysis.token.mint,
+        analysis.safety_score,
+        analysis.sentiment_score,
+        analysis.momentum_score,
+        analysis.overall_score,
+        analysis.is_tradeable,
+        list(analysis.reasons),
+    )
+
+
+class TestArbiterBatchScoring:
+    """evaluate_batch must match per-token evaluate_token exactly"""
+    
+    @pytest.fixture(params=["jit", "numpy"])
+    def kernel(self, request, monkeypatch):
+        """Run with the numba kernel, then with the NumPy fallback"""
+        from src.agents import arbiter_agent
+        
+        if request.param == "jit":
+            if arbiter_agent._score_kernel_jit is None:
+                pytest.skip("numba not installed")
+        else:
+            monkeypatch.setattr(arbiter_agent, "_score_kernel_jit", None)
+        return request.param
+    
+    @pytest.mark.parametrize("strategy_name", ["MOMENTUM", "SNIPER", "WHALE_COPY"])
+    async def test_batch_matches_scalar(self, kernel, strategy_name):
+        """Test batch analyses equal scalar analyses token by token."""
+        from src.agents.arbiter_agent import ArbiterAgent
+        from src.constants import Strategy
+        
+        tokens, rug_checks, sentiments = _random_inputs()
+        arbiter = ArbiterAgent(Strategy[strategy_name])
+        
+        scalar = [
+            await arbiter.evaluate_token(t, rug_checks.get(t.mint), sentiments.get(t.mint))
+            for t in tokens
+        ]
+        batch = await arbiter.evaluate_batch(tokens, rug_checks, sentiments)
+        
+        assert [_fields(a) for a in batch] == [_fields(a) for a in scalar]
+        assert any(a.is_tradeable for a in batch)
+    
+    async def test_empty_batch(self, kernel):
+        """Test an empty batch returns no analyses."""
+        from src.agents.arbiter_agent import ArbiterAgent
+        
+        assert await ArbiterAgent().evaluate_batch([]) == []
@@ -0,0 +1,141 @@
+"""Backtest engine tests"""
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _candles(n: int = 120) -> pd.DataFrame:
+    """Deterministic candle series with a string column"""
+    rng = np.random.default_rng(7)
+    return pd.DataFrame({
+        "timestamp": np.arange(n) * 60,
+        "sym": ["SOL"] * n,
+        "close": np.cumprod(1 + rng.normal(0, 0.02, n)),
+    })
+
+
+def cycle_strategy(history: pd.DataFrame):
+    """BUY, BUY, SELL, hold, SELL, BUY by bar index"""
+    return ["BUY", "BUY", "SELL", None, "SELL", "BUY"][len(history) % 6]
+
+
+def mean_reversion_strategy(history: pd.DataFrame):
+    """Buy below / sell above the 5-bar mean"""
+    if len(history) < 5:
+        return None
+    close = history["close"]
+    mean = close.iloc[-5:].mean()
+    if close.iloc[-1] < mean * 0.99:
+        return "BUY"
+    if close.iloc[-1] > mean * 1.01:
+        return "SELL"
+    return None
+
+
+def symbol_strategy(history: pd.DataFrame):
+    """Reads the string column, so it fails if it arrives corrupted"""
+    if len(history) and history["sym"].iloc[-1] != "SOL":
+        raise ValueError("bad symbol column")
+    return cycle_strategy(history)
+
+
+# Hand-computed replay: bar -> (close, signal)
+_SCRIPT = [
+    (1.0, "BUY"),    # open A @ 1.0
+    (2.0, "BUY"),    # open B @ 2.0
+    (4.0, "SELL"),   # close B (LIFO): 0.05 * (4 - 2) = +0.10
+    (3.0, "SELL"),   # close A: 0.05 * (3 - 1) = +0.10
+    (5.0, "BUY"),    # open C @ 5.0
+    (2.0, "SELL"),   # close C: 0.05 * (2 - 5) = -0.15
+    (6.0, "BUY"),    # open D @ 6.0, still open at the end
+]
+
+
+def scripted_strategy(history: pd.DataFrame):
+    """Signal for the current bar (bar index == rows of history seen)"""
+    return _SCRIPT[len(history)][1]
+
+
+class TestBacktestReplay:
+    """Tests for the execute_backtest replay kernel"""
+    
+    @pytest.fixture(params=["jit", "python"])
+    def kernel(self, request, monkeypatch):
+        """Run with the numba kernel, then with the plain Python replay"""
+        from src.analysis import backtest
+        
+        if request.param == "jit":
+            if backtest._simulate_jit is None:
+                pytest.skip("numba not installed")
+        else:
+            monkeypatch.setattr(backtest, "_simulate_jit", None)
+        return request.param
+    
+    def test_lifo_stack_replay(self, kernel):
+        """Test BUY/BUY/SELL/SELL unwinds LIFO and an open position is kept."""
+        from src.analysis.backtest import BacktestEngine
+        data = pd.DataFrame({
+            "timestamp": np.arange(len(_SCRIPT)) * 60,
+            "close": [close for close, _ in _SCRIPT],
+        })
+        engine = BacktestEngine(starting_balance=25.0)
+        
+        results = engine.execute_backtest(data, scripted_strategy, max_position_size=0.05)
+        
+        assert results["total_trades"] == 3
+        assert results["winning_trades"] == 2
+        assert results["losing_trades"] == 1
+        assert results["win_rate"] == pytest.approx(2 / 3)
+        assert results["final_balance"] == pytest.approx(25.05)
+        assert results["total_pnl"] == pytest.approx(0.05)
+        assert results["max_drawdown"] == pytest.approx(0.15)
+        
+        assert [(t["entry"], t["exit"]) for t in engine.trades] == [(2.0, 4.0), (1.0, 3.0), (5.0, 2.0)]
+        assert [t["pnl"] for t in engine.trades] == pytest.approx([0.10, 0.10, -0.15])
+        assert [t["duration"] for t in engine.trades] == [60, 180, 60]
+        
+        assert engine.positions == [
+            {"entry_price": 6.0, "entry_time": 360, "amount_sol": 0.05, "status": "OPEN"}
+        ]
+    
+    def test_sell_without_position_is_ignored(self, kernel):
+        """Test a SELL with an empty stack records no trade."""
+        from src.analysis.backtest import BacktestEngine
+        data = pd.DataFrame({"timestamp": [0, 60], "close": [1.0, 2.0]})
+        
+        results = BacktestEngine().execute_backtest(data, lambda history: "SELL")
+        
+        assert results["total_trades"] == 0
+        assert results["final_balance"] == 25.0
+
+
+class TestBacktestSweep:
+    """Tests for BacktestEngine.sweep"""
+    
+    STRATEGIES = [cycle_strategy, mean_reversion_strategy, symbol_strategy]
+    
+    def _serial(self, data):
+        from src.analysis.backtest import BacktestEngine
+        return [BacktestEngine().execute_backtest(data, s) for s in self.STRATEGIES]
+    
+    def test_sweep_matches_serial(self):
+        """Test sweep returns the serial results in strategy order."""
+        from src.analysis.backtest import BacktestEngine
+        data = _candles()
+        
+        assert BacktestEngine().sweep(data, self.STRATEGIES, n_workers=2) == self._serial(data)
+    
+    def test_sweep_object_columns_under_spawn(self):
+        """Test string columns survive a spawn-started worker pool."""
+        from src.analysis.backtest import BacktestEngine
+        data = _candles()
+        data.index = data.index + 1000  # Non-default index is kept too
+        
+        results = BacktestEngine().sweep(
+            data, self.STRATEGIES, n_workers=2,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        
+        assert results == self._serial(data)
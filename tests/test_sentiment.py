@@ -0,0 +1,107 @@
+"""Sentiment agent tests"""
+import re
+
+import numpy as np
+
+
+class _FakeResponse:
+    """Minimal aiohttp response for one search page"""
+
+    def __init__(self, payload):
+        self.status = 200
+        self._payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self):
+        return self._payload
+
+
+class _FakeTwitter:
+    """
+    Twitter v2 recent search over an in-memory corpus (newest first):
+    OR'd $cashtag/#hashtag queries, until_id and next_token paging
+    """
+
+    def __init__(self, tweets):
+        self.tweets = tweets
+        self.requests = 0
+
+    def get(self, url, headers=None, params=None):
+        self.requests += 1
+        symbols = re.findall(r"\$(\w+)", params["query"])
+        pattern = re.compile(rf"[$#]({'|'.join(symbols)})(?!\w)", re.IGNORECASE)
+        until_id = int(params.get("until_id", 1 << 62))
+        matches = [
+            t for t in self.tweets
+            if int(t["id"]) < until_id and pattern.search(t["text"])
+        ]
+
+        offset = int(params.get("next_token", 0))
+        end = offset + params["max_results"]
+        payload = {"data": matches[offset:end], "meta": {}}
+        if end < len(matches):
+            payload["meta"]["next_token"] = str(end)
+        return _FakeResponse(payload)
+
+
+def _corpus():
+    """Tweets where one busy symbol would crowd the rest out of a shared page"""
+    rng = np.random.default_rng(11)
+    texts = (
+        ["$FLOOD to the moon 🚀"] * 900
+        + ["#MID looks bullish, lfg"] * 160
+        + ["$RARE rug warning"] * 45
+        + ["$MID and $RARE both early gems"] * 30
+        + ["$BONK2 wagmi"] * 70
+        + ["$BONK dump incoming"] * 25
+    )
+    order = rng.permutation(len(texts))
+    return [
+        {"id": str(10_000_000 - i), "text": texts[j]}
+        for i, j in enumerate(order)
+    ]
+
+
+class TestTwitterBatching:
+    """Batched searches must cover each symbol like a search per symbol"""
+
+    async def _analyze(self, tokens, max_symbols):
+        from src.agents.sentiment_agent import SentimentAgent
+
+        agent = SentimentAgent()
+        agent.twitter_bearer = "test"
+        agent.TWITTER_BATCH_MAX_SYMBOLS = max_symbols
+        agent.session = _FakeTwitter(_corpus())
+        results = await agent.analyze_multiple(tokens)
+        return results, agent.session.requests
+
+    async def test_mentions_do_not_shrink_under_batching(self):
+        """Per-symbol mention counts match one search per symbol"""
+        from src.types import TokenInfo
+
+        tokens = [
+            TokenInfo(mint=f"mint{i}", symbol=symbol, name=symbol)
+            for i, symbol in enumerate(["FLOOD", "MID", "RARE", "BONK2", "BONK", "NONE"])
+        ]
+        single, _ = await self._analyze(tokens, max_symbols=1)
+        batched, requests = await self._analyze(tokens, max_symbols=15)
+
+        for token in tokens:
+            expected = single[token.mint]
+            got = batched[token.mint]
+            assert got.twitter_mentions == expected.twitter_mentions, token.symbol
+            assert got.twitter_score == expected.twitter_score, token.symbol
+            assert got.is_trending == expected.is_trending, token.symbol
+
+        assert single["mint0"].twitter_mentions == 100
+        assert single["mint1"].twitter_mentions == 100
+        assert single["mint2"].twitter_mentions == 75
+        assert single["mint3"].twitter_mentions == 70
+        assert single["mint4"].twitter_mentions == 25
+        assert single["mint5"].twitter_mentions == 0
+        assert requests <= len(tokens)